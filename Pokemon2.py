@@ -2,19 +2,28 @@ import tkinter as tk
 from tkinter import ttk, scrolledtext
 from PIL import Image, ImageTk
 from random import choice
+import os
+import sys
+
+# Pokemon2 sits in the repository root while battle_core lives in
+# ProjectPemlan_Pokemon/, which is a plain folder of scripts rather than an
+# importable package, so its directory has to be put on the path first
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "ProjectPemlan_Pokemon"))
+
+# The type chart battle_core compiled at import, shared rather than loaded
+# a second time
+from battle_core import element_ids, effectiveness_matrix, pokemon_skills, no_skills
 
 class Pokemon:
     def __init__(self, name, element, hp):
         self.name = name
         self.element = element
         self.hp = hp
-        self.skills = {"Tackle": 20, "Ember": 30, "Water Gun": 25}
-        self.elemental_effectiveness = {
-            "water": {"effective": ["fire"], "ineffective": ["electric"]},
-            "fire": {"effective": ["grass"], "ineffective": ["water"]},
-            "grass": {"effective": ["water"], "ineffective": ["fire"]},
-            "electric": {"effective": ["water"], "ineffective": ["grass"]}
-        }
+        if element not in element_ids:
+            raise ValueError(f"Unknown element: {element}")
+        self.element_id = element_ids[element]
+        # Per-species skills from species.json, the same tables the main game uses
+        self.skills = pokemon_skills.get(name, no_skills)
         self.battle_log = []
 
     def attack(self, target, skill_name):
@@ -40,12 +49,10 @@ class Pokemon:
             self.hp = 0
 
     def get_effectiveness(self, target_element):
-        if target_element in self.elemental_effectiveness[self.element]["effective"]:
-            return 2
-        elif target_element in self.elemental_effectiveness[self.element]["ineffective"]:
-            return 0.5
-        else:
+        target_id = element_ids.get(target_element)
+        if target_id is None:
             return 1
+        return effectiveness_matrix[self.element_id][target_id]
 
     def is_knocked_out(self):
         return self.hp == 0
@@ -0,0 +1,116 @@
+import asyncio
+import json
+import random
+import time
+
+from battle_core import pokemon_options
+from arena_server import DEFAULT_PORT
+
+
+class ArenaClient:
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+
+    @classmethod
+    async def connect(cls, host="127.0.0.1", port=DEFAULT_PORT, unix_path=None):
+        if unix_path:
+            reader, writer = await asyncio.open_unix_connection(unix_path)
+        else:
+            reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer)
+
+    async def request(self, **request):
+        self.writer.write(json.dumps(request).encode() + b"\n")
+        reply = json.loads(await self.reader.readline())
+        if not reply["ok"]:
+            raise RuntimeError(reply["error"])
+        return reply
+
+    async def close(self):
+        self.writer.close()
+        await self.writer.wait_closed()
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+async def play_connection(client, battles, open_sessions, rng, latencies):
+    # Keeps open_sessions battles going on this connection at once, making
+    # one move in each in turn, until `battles` battles have finished
+    async def timed(**request):
+        start = time.perf_counter()
+        reply = await client.request(**request)
+        latencies.append(time.perf_counter() - start)
+        return reply
+
+    async def start():
+        player = rng.choice(pokemon_options)["name"]
+        opponent = rng.choice(pokemon_options)["name"]
+        reply = await timed(op="new", player=player, opponent=opponent, seed=rng.getrandbits(63))
+        return [reply["session"], reply["skills"]]
+
+    started = 0
+    active = []
+    while started < battles and len(active) < open_sessions:
+        active.append(await start())
+        started += 1
+
+    while active:
+        for battle in list(active):
+            reply = await timed(op="move", session=battle[0], skill=rng.choice(battle[1]))
+            if reply["winner"] is not None:
+                active.remove(battle)
+                if started < battles:
+                    active.append(await start())
+                    started += 1
+
+
+async def run_load(host, port, unix_path, connections, battles, open_sessions, seed):
+    rng = random.Random(seed)
+    clients = [await ArenaClient.connect(host, port, unix_path) for _ in range(connections)]
+    latencies = []
+
+    per_connection = [battles // connections + (i < battles % connections) for i in range(connections)]
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        play_connection(client, count, open_sessions, random.Random(rng.getrandbits(64)), latencies)
+        for client, count in zip(clients, per_connection)
+    ))
+    elapsed = time.perf_counter() - start
+
+    stats = await clients[0].request(op="stats")
+    for client in clients:
+        await client.close()
+
+    latencies.sort()
+    print(f"{battles} battles, {len(latencies)} requests in {elapsed:.2f}s")
+    print(f"Throughput: {len(latencies) / elapsed:,.0f} requests/s, {battles / elapsed:,.0f} battles/s")
+    print(f"Peak open sessions: {connections * open_sessions}")
+    print("Latency ms: " + ", ".join(
+        f"p{int(p * 100)} {1000 * percentile(latencies, p):.3f}" for p in (0.5, 0.9, 0.99)
+    ) + f", max {1000 * latencies[-1]:.3f}")
+    print(f"Server: {stats['sessions']} sessions open, {stats['finished']} finished, {stats['evicted']} evicted")
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Load generator for arena_server.py")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--unix", help="connect to a Unix socket instead of TCP")
+    parser.add_argument("-c", "--connections", type=int, default=10)
+    parser.add_argument("-n", "--battles", type=int, default=10000, help="battles to play in total")
+    parser.add_argument("-s", "--open-sessions", type=int, default=100, help="battles kept open per connection")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    asyncio.run(run_load(args.host, args.port, args.unix, args.connections, args.battles, args.open_sessions, args.seed))
+
+
+if __name__ == "__main__":
+    main()
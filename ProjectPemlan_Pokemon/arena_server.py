@@ -0,0 +1,244 @@
+import asyncio
+import itertools
+import json
+import random
+import time
+from collections import OrderedDict
+
+from battle_core import Pokemon, BattleSimulator, CompactRandom, pokemon_options
+from battle_events import PLAYER
+
+# Protocol: one JSON object per line in each direction, answered in order.
+#   {"op": "new", "player": "Charmander", "opponent": "Squirtle", "seed": 1}
+#   {"op": "move", "session": 3, "skill": "Scratch"}
+#   {"op": "close", "session": 3}
+#   {"op": "stats"}
+# Every reply has "ok"; failures carry "error" instead of a result.
+# Session seeds drive battle_core.CompactRandom, not random.Random, so they
+# reproduce a battle on another arena but cannot be fed to replay.py.
+
+DEFAULT_PORT = 8765
+
+
+class ArenaError(Exception):
+    pass
+
+
+class Arena:
+    # Holds every live battle. Sessions are kept in least-recently-used
+    # order so idle ones can be evicted from the front cheaply.
+    def __init__(self, roster=None, idle_timeout=300.0, max_sessions=100000):
+        self.species = {entry["name"]: entry for entry in (roster or pokemon_options)}
+        self.idle_timeout = idle_timeout
+        self.max_sessions = max_sessions
+        self.sessions = OrderedDict()
+        self.session_ids = itertools.count(1)
+        self.requests = 0
+        self.finished = 0
+        self.evicted = 0
+
+    def pokemon(self, name):
+        entry = self.species.get(name)
+        if entry is None:
+            raise ArenaError(f"Unknown Pokemon: {name}")
+        return Pokemon(entry["name"], entry["element"], entry["hp"])
+
+    def session(self, session_id):
+        entry = self.sessions.get(session_id)
+        if entry is None:
+            raise ArenaError(f"Unknown or expired session: {session_id}")
+        entry[1] = time.monotonic()
+        self.sessions.move_to_end(session_id)
+        return entry[0]
+
+    def new_battle(self, request):
+        player = self.pokemon(request.get("player"))
+        opponent = self.pokemon(request.get("opponent"))
+        seed = request.get("seed")
+        if seed is None:
+            seed = random.getrandbits(64)
+        # Two events is all one move can produce, so that is all a session
+        # keeps. With the one-integer generator a session takes about 1.6 KB
+        # (4.6 KB with a Mersenne Twister each), so --max-sessions also
+        # bounds memory: the default 100000 is roughly 160 MB.
+        simulator = BattleSimulator(player, opponent, log_capacity=2, rng=CompactRandom(seed))
+
+        session_id = next(self.session_ids)
+        self.sessions[session_id] = [simulator, time.monotonic()]
+        if len(self.sessions) > self.max_sessions:
+            self.sessions.popitem(last=False)
+            self.evicted += 1
+        return {
+            "session": session_id,
+            "seed": seed,
+            "skills": list(player.skills),
+            "player_hp": player.hp,
+            "opponent_hp": opponent.hp,
+        }
+
+    def move(self, request):
+        session_id = request.get("session")
+        simulator = self.session(session_id)
+        skill = request.get("skill")
+        if skill not in simulator.player_pokemon.skills:
+            raise ArenaError(f"{simulator.player_pokemon.name} does not know {skill}")
+
+        events = simulator.events
+        first = events.total
+        simulator.player_attack(skill)
+
+        turn_events = []
+        for index in range(first, events.total):
+            _, actor, skill_name, multiplier, damage, hp_after, ko = events.event(index)
+            turn_events.append({
+                "actor": "player" if actor == PLAYER else "opponent",
+                "skill": skill_name,
+                "multiplier": multiplier,
+                "damage": damage,
+                "hp_after": hp_after,
+                "ko": ko,
+            })
+
+        winner = None
+        if simulator.opponent_pokemon.is_knocked_out():
+            winner = "player"
+        elif simulator.player_pokemon.is_knocked_out():
+            winner = "opponent"
+        if winner is not None:
+            del self.sessions[session_id]
+            self.finished += 1
+
+        return {
+            "session": session_id,
+            "turn": simulator.turn,
+            "events": turn_events,
+            "player_hp": simulator.player_pokemon.hp,
+            "opponent_hp": simulator.opponent_pokemon.hp,
+            "winner": winner,
+        }
+
+    def close(self, request):
+        if self.sessions.pop(request.get("session"), None) is None:
+            raise ArenaError(f"Unknown or expired session: {request.get('session')}")
+        return {}
+
+    def stats(self, request):
+        return {
+            "sessions": len(self.sessions),
+            "requests": self.requests,
+            "finished": self.finished,
+            "evicted": self.evicted,
+        }
+
+    def evict_idle(self):
+        deadline = time.monotonic() - self.idle_timeout
+        while self.sessions:
+            session_id, (_, last_seen) = next(iter(self.sessions.items()))
+            if last_seen > deadline:
+                break
+            del self.sessions[session_id]
+            self.evicted += 1
+
+    def handle(self, request):
+        self.requests += 1
+        handler = {"new": self.new_battle, "move": self.move, "close": self.close, "stats": self.stats}.get(request.get("op"))
+        if handler is None:
+            raise ArenaError(f"Unknown op: {request.get('op')}")
+        reply = handler(request)
+        reply["ok"] = True
+        return reply
+
+
+TOO_LONG = object()
+
+
+async def read_request(reader):
+    # One request line, b"" at end of stream, or TOO_LONG for a line over
+    # the stream limit. The oversized line is read to its end and dropped,
+    # so the next request on the connection still parses.
+    try:
+        return await reader.readuntil(b"\n")
+    except asyncio.IncompleteReadError as e:
+        return e.partial
+    except asyncio.LimitOverrunError:
+        pass
+    while True:
+        try:
+            await reader.readuntil(b"\n")
+            return TOO_LONG
+        except asyncio.LimitOverrunError as e:
+            await reader.readexactly(e.consumed)
+        except asyncio.IncompleteReadError:
+            return b""
+
+
+async def serve_client(arena, reader, writer):
+    try:
+        while True:
+            line = await read_request(reader)
+            if not line:
+                break
+            try:
+                if line is TOO_LONG:
+                    raise ArenaError("Request line too long")
+                request = json.loads(line)
+                if not isinstance(request, dict):
+                    raise ArenaError("Request must be a JSON object")
+                reply = arena.handle(request)
+            except (ArenaError, ValueError, TypeError) as e:
+                reply = {"ok": False, "error": str(e)}
+            writer.write(json.dumps(reply).encode() + b"\n")
+            # Only wait for the socket when the client is not keeping up
+            if writer.transport.get_write_buffer_size() > 65536:
+                await writer.drain()
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except ConnectionError:
+            pass
+
+
+async def evict_periodically(arena):
+    while True:
+        await asyncio.sleep(max(arena.idle_timeout / 4, 0.1))
+        arena.evict_idle()
+
+
+async def run_server(host="127.0.0.1", port=DEFAULT_PORT, unix_path=None, idle_timeout=300.0, max_sessions=100000):
+    arena = Arena(idle_timeout=idle_timeout, max_sessions=max_sessions)
+    handler = lambda reader, writer: serve_client(arena, reader, writer)
+    if unix_path:
+        server = await asyncio.start_unix_server(handler, path=unix_path)
+    else:
+        server = await asyncio.start_server(handler, host, port)
+    evictor = asyncio.create_task(evict_periodically(arena))
+    print(f"Arena listening on {unix_path or f'{host}:{port}'}")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        evictor.cancel()
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Host many concurrent battles over a JSON-lines socket")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--unix", help="listen on a Unix socket instead of TCP")
+    parser.add_argument("--idle-timeout", type=float, default=300.0, help="seconds before an idle session is dropped")
+    parser.add_argument("--max-sessions", type=int, default=100000, help="oldest sessions are evicted beyond this; about 1.6 KB each")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(run_server(args.host, args.port, args.unix, args.idle_timeout, args.max_sessions))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
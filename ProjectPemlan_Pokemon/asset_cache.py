@@ -0,0 +1,140 @@
+import argparse
+import json
+import os
+import threading
+from collections import OrderedDict
+
+from PIL import Image
+from PIL.PngImagePlugin import PngInfo
+
+ASSET_DIR = os.path.dirname(os.path.abspath(__file__))
+ATLAS_PATH = os.path.join(ASSET_DIR, "sprite_atlas.png")
+
+SPRITE_SIZE = (100, 100)
+LOGO_SIZE = (325, 125)
+
+
+def find_asset(name, extension=".png"):
+    # File names on disk are not consistently cased (Bulbasaur.png vs
+    # squirtle.png), so match case-insensitively
+    wanted = (name + extension).lower()
+    for file_name in os.listdir(ASSET_DIR):
+        if file_name.lower() == wanted:
+            return os.path.join(ASSET_DIR, file_name)
+    raise FileNotFoundError(f"No asset named {name}{extension} in {ASSET_DIR}")
+
+
+def atlas_sizes(name):
+    return [LOGO_SIZE] if name.lower() == "logo" else [SPRITE_SIZE]
+
+
+def build_atlas(path=ATLAS_PATH):
+    # Pre-renders every PNG in the asset folder at the sizes the UI uses
+    # into one image, with the layout stored in a PNG text chunk
+    sprites = []
+    for file_name in sorted(os.listdir(ASSET_DIR)):
+        source = os.path.join(ASSET_DIR, file_name)
+        if not file_name.lower().endswith(".png") or source == path:
+            continue
+        name = os.path.splitext(file_name)[0].lower()
+        image = Image.open(source).convert("RGBA")
+        for size in atlas_sizes(name):
+            sprites.append((name, size, os.path.getmtime(source), image.resize(size, Image.BICUBIC)))
+
+    # Simple shelf packing: one row per sprite height, left to right
+    width = max(size[0] for _, size, _, _ in sprites)
+    index = []
+    x = y = row_height = 0
+    for name, size, mtime, _ in sprites:
+        if x + size[0] > width:
+            x, y, row_height = 0, y + row_height, 0
+        index.append({"name": name, "size": list(size), "box": [x, y, x + size[0], y + size[1]], "mtime": mtime})
+        x += size[0]
+        row_height = max(row_height, size[1])
+
+    atlas = Image.new("RGBA", (width, y + row_height))
+    for entry, (_, _, _, image) in zip(index, sprites):
+        atlas.paste(image, tuple(entry["box"][:2]))
+
+    info = PngInfo()
+    info.add_text("atlas", json.dumps(index))
+    atlas.save(path, pnginfo=info)
+    return index
+
+
+class SpriteCache:
+    # Resized PIL images keyed by (name, size) with LRU eviction. Misses are
+    # served from the atlas when it has an up-to-date entry, otherwise the
+    # PNG is decoded and resized once
+    def __init__(self, maxsize=64, atlas_path=ATLAS_PATH):
+        self.maxsize = maxsize
+        self.atlas_path = atlas_path
+        self.images = OrderedDict()
+        self.lock = threading.Lock()
+        self.atlas = None
+        self.atlas_index = None
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, name, size=SPRITE_SIZE):
+        key = (name.lower(), tuple(size))
+        # The background asset loader fills the cache from another thread
+        with self.lock:
+            image = self.images.get(key)
+            if image is not None:
+                self.images.move_to_end(key)
+                self.hits += 1
+                return image
+
+            self.misses += 1
+            image = self.from_atlas(key)
+            if image is None:
+                image = Image.open(find_asset(key[0])).resize(key[1], Image.BICUBIC)
+            self.images[key] = image
+            if len(self.images) > self.maxsize:
+                self.images.popitem(last=False)
+            return image
+
+    def from_atlas(self, key):
+        if self.atlas_index is None:
+            self.atlas_index = {}
+            if os.path.exists(self.atlas_path):
+                with Image.open(self.atlas_path) as atlas:
+                    atlas.load()
+                    entries = json.loads(atlas.text.get("atlas", "[]"))
+                    self.atlas = atlas.copy()
+                for entry in entries:
+                    self.atlas_index[(entry["name"], tuple(entry["size"]))] = entry
+
+        entry = self.atlas_index.get(key)
+        if entry is None:
+            return None
+        try:
+            if os.path.getmtime(find_asset(key[0])) != entry["mtime"]:
+                return None
+        except FileNotFoundError:
+            pass
+        return self.atlas.crop(tuple(entry["box"]))
+
+    def clear(self):
+        with self.lock:
+            self.images.clear()
+
+
+sprite_cache = SpriteCache()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sprite asset tools")
+    parser.add_argument("--build-atlas", action="store_true", help=f"pre-render all sprites into {os.path.basename(ATLAS_PATH)}")
+    args = parser.parse_args()
+
+    if args.build_atlas:
+        index = build_atlas()
+        print(f"Packed {len(index)} sprites into {ATLAS_PATH}")
+    else:
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+import queue
+import sys
+import threading
+
+
+class AsyncAssetLoader:
+    # Runs slow loading jobs (decoding images, loading music) on one worker
+    # thread. Results are handed back to the Tk main thread by polling a
+    # queue from root.after, since Tk widgets must only be touched there.
+    POLL_MS = 15
+
+    def __init__(self, root):
+        self.root = root
+        self.jobs = queue.Queue()
+        self.results = queue.Queue()
+        self.pending = 0
+        self.polling = False
+        self.worker = threading.Thread(target=self.run, name="asset-loader", daemon=True)
+        self.worker.start()
+
+    def submit(self, load, callback=None, on_error=None):
+        # load() runs on the worker; callback(result) or on_error(exc) runs
+        # on the Tk thread. Must be called from the Tk thread.
+        self.pending += 1
+        self.jobs.put((load, callback, on_error))
+        if not self.polling:
+            self.polling = True
+            self.root.after(self.POLL_MS, self.poll)
+
+    def run(self):
+        while True:
+            load, callback, on_error = self.jobs.get()
+            try:
+                self.results.put((callback, on_error, load(), None))
+            except Exception as e:
+                self.results.put((callback, on_error, None, e))
+
+    def poll(self):
+        while True:
+            try:
+                callback, on_error, result, error = self.results.get_nowait()
+            except queue.Empty:
+                break
+            self.pending -= 1
+            if error is not None:
+                if on_error is not None:
+                    on_error(error)
+                else:
+                    print(f"Asset loading failed: {error}", file=sys.stderr)
+            elif callback is not None:
+                callback(result)
+
+        if self.pending:
+            self.root.after(self.POLL_MS, self.poll)
+        else:
+            self.polling = False
@@ -0,0 +1,169 @@
+import json
+import os
+import random
+from types import MappingProxyType
+
+from battle_events import BattleEventLog, PLAYER, OPPONENT
+from species_db import SpeciesDatabase
+
+TYPE_CHART_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "type_chart.json")
+
+def load_type_chart(path=TYPE_CHART_PATH):
+    # Compiles the chart once into element -> id and a square multiplier
+    # matrix indexed [attacker_id][defender_id]
+    with open(path) as f:
+        chart = json.load(f)
+    multipliers = chart["multipliers"]
+    types = chart["types"]
+
+    ids = {}
+    for element, relations in types.items():
+        ids.setdefault(element, len(ids))
+        for targets in relations.values():
+            for target in targets:
+                ids.setdefault(target, len(ids))
+
+    matrix = [[1] * len(ids) for _ in ids]
+    for element, relations in types.items():
+        for relation, targets in relations.items():
+            for target in targets:
+                matrix[ids[element]][ids[target]] = multipliers[relation]
+    return ids, matrix
+
+element_ids, effectiveness_matrix = load_type_chart()
+
+species_db = SpeciesDatabase.load(elements=element_ids)
+
+pokemon_options = species_db.options()
+
+# Read-only skill tables shared by every Pokemon of the same species
+pokemon_skills = {species.name: species.skills for species in species_db.species}
+no_skills = MappingProxyType({})
+
+class Creature:
+    __slots__ = ("name", "hp")
+
+    def __init__(self, name, hp):
+        self.name = name
+        self.hp = hp
+
+    def receive_damage(self, damage):
+        self.hp -= damage
+        if self.hp <= 0:
+            self.hp = 0
+
+    def is_knocked_out(self):
+        return self.hp == 0
+
+class Pokemon(Creature):
+    __slots__ = ("element", "element_id", "skills")
+
+    def __init__(self, name, element, hp):
+        super().__init__(name, hp)
+        self.element = element
+        if element not in element_ids:
+            raise ValueError(f"Unknown element: {element}")
+        self.element_id = element_ids[element]
+        self.skills = self.get_pokemon_skills(name)
+
+    def get_pokemon_skills(self, name):
+        return pokemon_skills.get(name, no_skills)
+
+    def attack(self, target, skill_name):
+        skill_damage = self.skills.get(skill_name, 0)
+        effectiveness = effectiveness_matrix[self.element_id][target.element_id]
+        damage = skill_damage * effectiveness
+        target.receive_damage(damage)
+        return damage
+
+    def get_effectiveness(self, target_element):
+        target_id = element_ids.get(target_element)
+        if target_id is None:
+            return 1
+        return effectiveness_matrix[self.element_id][target_id]
+
+class CompactRandom:
+    # SplitMix64: a seeded generator whose whole state is one integer, for
+    # places that keep very many generators alive at once (arena sessions).
+    # random.Random carries about 2.5 KB of Mersenne Twister state each.
+    # Only the methods the battle code uses are provided, and its sequence
+    # differs from random.Random's, so its seeds do not work with replay.py.
+    __slots__ = ("state",)
+
+    MASK = (1 << 64) - 1
+
+    def __init__(self, seed):
+        self.state = seed & self.MASK
+
+    def random(self):
+        self.state = z = (self.state + 0x9E3779B97F4A7C15) & self.MASK
+        z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & self.MASK
+        z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & self.MASK
+        return ((z ^ (z >> 31)) >> 11) * (1.0 / (1 << 53))
+
+    def choice(self, sequence):
+        return sequence[int(self.random() * len(sequence))]
+
+class RandomPolicy:
+    # Opponent policies pick the opponent's skill for each turn through
+    # choose_skill(simulator). This default draws uniformly from the
+    # simulator's rng, so a seed is enough to replay the battle.
+    def choose_skill(self, simulator):
+        return simulator.rng.choice(list(simulator.opponent_pokemon.skills.keys()))
+
+random_policy = RandomPolicy()
+
+class BattleSimulator(Creature):
+    __slots__ = ("player_pokemon", "opponent_pokemon", "turn", "events", "seed", "rng", "moves", "skill_indices", "opponent_policy")
+
+    # Marks a player move that is not one of the Pokemon's skills in self.moves
+    UNKNOWN_SKILL = 255
+
+    def __init__(self, player_pokemon, opponent_pokemon, log=True, log_capacity=1024, seed=None, rng=None, opponent_policy=random_policy):
+        super().__init__("BattleSimulator", 0)
+        self.player_pokemon = player_pokemon
+        self.opponent_pokemon = opponent_pokemon
+        self.turn = 0
+        # Headless runs pass log=False so nothing is recorded per turn
+        self.events = BattleEventLog(player_pokemon.name, opponent_pokemon.name, log_capacity) if log else None
+        # The seed plus the player's skill indices in self.moves are enough
+        # to replay the battle exactly (see replay.py). Bulk runs can pass a
+        # shared rng instead to skip seeding a generator per battle, at the
+        # cost of the battle not being replayable on its own.
+        if rng is None:
+            self.seed = random.getrandbits(64) if seed is None else seed
+            self.rng = random.Random(self.seed)
+        else:
+            self.seed = None
+            self.rng = rng
+        self.moves = bytearray()
+        # Only seeded battles can be replayed, so only they record moves
+        if self.seed is None:
+            self.skill_indices = None
+        else:
+            self.skill_indices = {skill: index for index, skill in enumerate(player_pokemon.skills)}
+        self.opponent_policy = opponent_policy
+
+    def player_attack(self, skill_name):
+        self.turn += 1
+        if self.skill_indices is not None:
+            self.moves.append(self.skill_indices.get(skill_name, self.UNKNOWN_SKILL))
+
+        damage_dealt = self.player_pokemon.attack(self.opponent_pokemon, skill_name)
+        if self.events is not None:
+            self.record_event(PLAYER, self.player_pokemon, self.opponent_pokemon, skill_name, damage_dealt)
+
+        if not self.opponent_pokemon.is_knocked_out():
+            self.opponent_attack()
+
+    def opponent_attack(self):
+        if not self.player_pokemon.is_knocked_out():
+            selected_skill = self.opponent_policy.choose_skill(self)
+
+            damage_dealt = self.opponent_pokemon.attack(self.player_pokemon, selected_skill)
+            if self.events is not None:
+                self.record_event(OPPONENT, self.opponent_pokemon, self.player_pokemon, selected_skill, damage_dealt)
+
+    def record_event(self, actor, attacker, target, skill_name, damage):
+        multiplier = effectiveness_matrix[attacker.element_id][target.element_id]
+        self.events.record(self.turn, actor, skill_name, multiplier, damage, target.hp)
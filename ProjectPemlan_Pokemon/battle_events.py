@@ -0,0 +1,83 @@
+from array import array
+
+PLAYER = 0
+OPPONENT = 1
+
+
+class BattleEventLog:
+    # Fixed-size ring buffer of attack events stored in typed arrays.
+    # Nothing is formatted until a viewer asks for text, and once the buffer
+    # is full the oldest events are overwritten.
+    def __init__(self, player_name, opponent_name, capacity=1024):
+        self.names = (player_name, opponent_name)
+        self.capacity = capacity
+        self.total = 0
+        self.skill_names = []
+        self.skill_ids = {}
+
+        self.turn = array("I", [0]) * capacity
+        self.actor = array("B", [0]) * capacity
+        self.skill = array("H", [0]) * capacity
+        self.multiplier = array("d", [0]) * capacity
+        self.damage = array("d", [0]) * capacity
+        self.hp_after = array("d", [0]) * capacity
+        self.ko = array("B", [0]) * capacity
+
+    def __len__(self):
+        return min(self.total, self.capacity)
+
+    @property
+    def first(self):
+        # Index of the oldest event still held in the buffer
+        return self.total - len(self)
+
+    def skill_id(self, skill_name):
+        skill_id = self.skill_ids.get(skill_name)
+        if skill_id is None:
+            skill_id = len(self.skill_names)
+            self.skill_names.append(skill_name)
+            self.skill_ids[skill_name] = skill_id
+        return skill_id
+
+    def record(self, turn, actor, skill_name, multiplier, damage, hp_after):
+        slot = self.total % self.capacity
+        self.turn[slot] = turn
+        self.actor[slot] = actor
+        self.skill[slot] = self.skill_id(skill_name)
+        self.multiplier[slot] = multiplier
+        self.damage[slot] = damage
+        self.hp_after[slot] = hp_after
+        self.ko[slot] = hp_after == 0
+        self.total += 1
+
+    def event(self, index):
+        if not self.first <= index < self.total:
+            raise IndexError(f"Event {index} is no longer in the log")
+        slot = index % self.capacity
+        return (
+            self.turn[slot],
+            self.actor[slot],
+            self.skill_names[self.skill[slot]],
+            self.multiplier[slot],
+            self.damage[slot],
+            self.hp_after[slot],
+            bool(self.ko[slot]),
+        )
+
+    def format(self, index):
+        _, actor, skill_name, multiplier, damage, _, ko = self.event(index)
+        attacker = self.names[actor]
+        target = self.names[1 - actor]
+        text = f"{attacker} using {skill_name}, dealing damage to {target}, Damage: {damage:g}"
+        if multiplier > 1:
+            text += " (SUPER EFFECTIVE!)"
+        elif multiplier < 1:
+            text += " (not very effective)"
+        if ko:
+            text += f"\n{target} is KO'd, {attacker} WINS"
+        return text
+
+    def lines(self, start=None, stop=None):
+        start = self.first if start is None else max(start, self.first)
+        stop = self.total if stop is None else min(stop, self.total)
+        return [self.format(index) for index in range(start, stop)]
@@ -0,0 +1,157 @@
+import tkinter as tk
+from collections import deque
+from tkinter import ttk, scrolledtext
+
+from photo_pool import get_pool
+from solver import optimal_move
+
+class BattleLogWindow:
+    # The text widget only holds the newest entries; older ones stay in the
+    # simulator's event log and are paged back in on request
+    MAX_VISIBLE_ENTRIES = 200
+    PAGE_SIZE = 50
+
+    def __init__(self, root, player_pokemon, simulator):
+        self.root = root
+        self.player_pokemon = player_pokemon
+        self.simulator = simulator
+        self.game_over = False
+        self.game_over_shown = False
+        self.rendered_entries = 0
+        self.first_visible_entry = 0
+        self.visible_line_counts = deque()
+        self.render_pending = False
+
+        root.title("Pokemon Battle Simulator")
+
+        hp_frame = ttk.Frame(root)
+        hp_frame.grid(row=0, column=0, columnspan=3, pady=10)
+
+        self.player_hp_label = ttk.Label(hp_frame, text=f"{player_pokemon.name} HP: {player_pokemon.hp}")
+        self.player_hp_label.grid(row=0, column=0, padx=5)
+
+        self.opponent_hp_label = ttk.Label(hp_frame, text=f"{simulator.opponent_pokemon.name} HP: {simulator.opponent_pokemon.hp}")
+        self.opponent_hp_label.grid(row=0, column=1, padx=5)
+
+        image_frame = ttk.Frame(root)
+        image_frame.grid(row=1, column=0, columnspan=3, pady=10)
+
+        # Sprites come from the root's shared pool, which keeps them alive
+        # until this window is destroyed
+        self.player_image = self.load_pokemon_image(player_pokemon.name.lower())
+        self.player_image_label = tk.Label(image_frame, image=self.player_image)
+        self.player_image_label.grid(row=0, column=0, padx=5)
+
+        self.opponent_image = self.load_pokemon_image(simulator.opponent_pokemon.name.lower())
+        self.opponent_image_label = tk.Label(image_frame, image=self.opponent_image)
+        self.opponent_image_label.grid(row=0, column=1, padx=5)
+
+        log_frame = ttk.Frame(root)
+        log_frame.grid(row=2, column=0, columnspan=3, pady=10)
+
+        self.text_widget = scrolledtext.ScrolledText(log_frame, height=10, width=50)
+        self.text_widget.grid(row=0, column=0, padx=10, pady=10, sticky="nsew")
+
+        frame = ttk.Frame(log_frame)
+        frame.grid(row=1, column=0, pady=10)
+
+        s = ttk.Style()
+        s.configure('Rounded.TButton', relief="flat", background=root.cget('bg'))
+
+        self.player_attack_button = ttk.Button(frame, text="Player Attack", style='Rounded.TButton', command=self.player_attack)
+        self.player_attack_button.grid(row=0, column=0, padx=5)
+
+        skill_label = tk.Label(frame, text="Choose a skill:")
+        skill_label.grid(row=0, column=1, padx=5)
+
+        self.skill_var = tk.StringVar(frame)
+        self.skill_var.set(list(player_pokemon.skills.keys())[0])
+
+        self.skill_menu = ttk.Combobox(frame, textvariable=self.skill_var, style='Rounded.TCombobox')
+        self.skill_menu.grid(row=0, column=2, padx=5)
+
+        self.older_button = ttk.Button(frame, text="Older", style='Rounded.TButton', command=self.show_older_entries)
+        self.older_button.grid(row=0, column=3, padx=5)
+
+        self.hint_label = ttk.Label(frame, text="")
+        self.hint_label.grid(row=1, column=0, columnspan=4, pady=5)
+
+        root.columnconfigure(0, weight=1)
+        log_frame.columnconfigure(0, weight=1)
+        frame.columnconfigure(1, weight=1)
+
+        self.update_battle_log()
+        self.load_pokemon_images()
+
+    def update_battle_log(self):
+        self.player_hp_label.config(text=f"{self.player_pokemon.name} HP: {self.player_pokemon.hp}")
+        self.opponent_hp_label.config(text=f"{self.simulator.opponent_pokemon.name} HP: {self.simulator.opponent_pokemon.hp}")
+        if self.player_pokemon.is_knocked_out() or self.simulator.opponent_pokemon.is_knocked_out():
+            self.game_over = True
+
+        hint = ""
+        if not self.game_over:
+            skill, win, _ = optimal_move(self.simulator)
+            if skill is not None:
+                hint = f"Hint: {skill} ({100 * win:.0f}% chance to win)"
+        self.hint_label.config(text=hint)
+
+        # Several updates in one event loop pass are rendered together
+        if not self.render_pending:
+            self.render_pending = True
+            self.root.after_idle(self.render_new_entries)
+
+    def render_new_entries(self):
+        self.render_pending = False
+        events = self.simulator.events
+        # Events that fell out of the ring buffer before we got here are skipped
+        start = max(self.rendered_entries, events.first)
+        new_entries = events.lines(start, events.total)
+        self.rendered_entries = events.total
+        if not self.visible_line_counts:
+            self.first_visible_entry = start
+
+        text = "".join(entry + "\n" for entry in new_entries)
+        self.visible_line_counts.extend(entry.count("\n") + 1 for entry in new_entries)
+        if self.game_over and not self.game_over_shown:
+            self.game_over_shown = True
+            text += "Game Over\n"
+        if not text:
+            return
+        self.text_widget.insert(tk.END, text)
+
+        overflow = len(self.visible_line_counts) - self.MAX_VISIBLE_ENTRIES
+        if overflow > 0:
+            lines = sum(self.visible_line_counts.popleft() for _ in range(overflow))
+            self.text_widget.delete(1.0, f"{lines + 1}.0")
+            self.first_visible_entry += overflow
+
+        self.text_widget.yview(tk.END)
+
+    def show_older_entries(self):
+        events = self.simulator.events
+        start = max(self.first_visible_entry - self.PAGE_SIZE, events.first)
+        older = events.lines(start, self.first_visible_entry)
+        if not older:
+            return
+        self.text_widget.insert(1.0, "".join(entry + "\n" for entry in older))
+        self.visible_line_counts.extendleft(entry.count("\n") + 1 for entry in reversed(older))
+        self.first_visible_entry = start
+        self.text_widget.yview(1.0)
+
+    def player_attack(self):
+        if not self.game_over:
+            selected_skill = self.skill_var.get()
+            self.simulator.player_attack(selected_skill)
+            self.update_battle_log()
+
+    def load_pokemon_images(self):
+        self.player_image_label['image'] = self.player_image
+        self.opponent_image_label['image'] = self.opponent_image
+
+        skills = list(self.player_pokemon.skills.keys())
+        self.skill_var.set(skills[0])
+        self.skill_menu['values'] = skills
+
+    def load_pokemon_image(self, pokemon_name):
+        return get_pool(self.root).acquire(self.root, pokemon_name)
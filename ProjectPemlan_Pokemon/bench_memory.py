@@ -0,0 +1,81 @@
+import argparse
+import gc
+import tracemalloc
+
+from battle_core import Pokemon, pokemon_options
+from roster_store import RosterStore
+
+
+class LegacyCreature:
+    # Copy of the original dict-backed classes, kept as the "before" case
+    def __init__(self, name, hp):
+        self.name = name
+        self.hp = hp
+        self.battle_log = []
+
+
+class LegacyPokemon(LegacyCreature):
+    def __init__(self, name, element, hp):
+        super().__init__(name, hp)
+        self.element = element
+        self.skills = self.get_pokemon_skills(name)
+        self.elemental_effectiveness = {
+            "water": {"effective": ["fire"], "ineffective": ["electric"]},
+            "fire": {"effective": ["grass"], "ineffective": ["water"]},
+            "grass": {"effective": ["water"], "ineffective": ["fire"]},
+            "electric": {"effective": ["water"], "ineffective": ["grass"]}
+        }
+
+    def get_pokemon_skills(self, name):
+        if name == "Squirtle":
+            return {"Tackle": 20, "Tail Whip": 10, "Bubble": 25}
+        elif name == "Bulbasaur":
+            return {"Tackle": 20, "Growl": 15}
+        elif name == "Charmander":
+            return {"Scratch": 25, "Growl": 15}
+        else:
+            return {}
+
+
+def build_objects(cls, count):
+    roster = pokemon_options
+    return [cls(roster[i % len(roster)]["name"], roster[i % len(roster)]["element"], roster[i % len(roster)]["hp"]) for i in range(count)]
+
+
+def build_store(count):
+    roster = pokemon_options
+    store = RosterStore()
+    for i in range(count):
+        choice = roster[i % len(roster)]
+        store.add(choice["name"], choice["element"], choice["hp"])
+    return store
+
+
+def measure(build, count):
+    gc.collect()
+    tracemalloc.start()
+    result = build(count)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    gc.collect()
+    return size / count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure bytes per Pokemon for each representation")
+    parser.add_argument("-n", "--count", type=int, default=1000000)
+    args = parser.parse_args()
+
+    cases = [
+        ("dict-backed (before)", lambda n: build_objects(LegacyPokemon, n)),
+        ("__slots__ Pokemon", lambda n: build_objects(Pokemon, n)),
+        ("RosterStore arrays", build_store),
+    ]
+    print(f"{args.count} instances")
+    for label, build in cases:
+        print(f"{label:<24}{measure(build, args.count):>10.1f} bytes/Pokemon")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+HISTORY_PATH = os.path.join(HERE, "startup_history.jsonl")
+
+# Modules a headless worker or the GUI entry point start from
+MODULES = ["battle_core", "headless", "replay", "tournament", "projectpokemon_pemlan"]
+
+
+def import_time(module, runs=5):
+    # Best of several fresh interpreters, using -X importtime for the
+    # cumulative import cost and the heaviest dependencies
+    best = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=HERE, capture_output=True, text=True, check=True,
+        )
+        wall = time.perf_counter() - start
+
+        # Lines look like "import time:  self |  cumulative |   name"; the
+        # indent of the name gives the nesting depth and children are
+        # printed before their parent
+        entries = []
+        for line in proc.stderr.splitlines():
+            if not line.startswith("import time:") or "cumulative" in line:
+                continue
+            _, cumulative_us, raw_name = line[len("import time:"):].split("|")
+            depth = (len(raw_name) - len(raw_name.lstrip()) - 1) // 2
+            entries.append((raw_name.strip(), depth, int(cumulative_us)))
+
+        position = next(i for i, (name, depth, _) in enumerate(entries) if name == module and depth == 0)
+        start_of_module = position
+        while start_of_module > 0 and entries[start_of_module - 1][1] > 0:
+            start_of_module -= 1
+        children = [(cumulative, name) for name, depth, cumulative in entries[start_of_module:position] if depth == 1]
+
+        total = entries[position][2]
+        if best is None or total < best["import_us"]:
+            best = {
+                "import_us": total,
+                "process_ms": round(wall * 1000, 1),
+                "heaviest": [{"module": name, "cumulative_us": cumulative} for cumulative, name in sorted(children, reverse=True)[:5]],
+            }
+    return best
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=HERE, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def last_record(path):
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        lines = [line for line in f if line.strip()]
+    return json.loads(lines[-1]) if lines else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure import cost of the battle entry points")
+    parser.add_argument("modules", nargs="*", default=MODULES)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--history", default=HISTORY_PATH, help="JSON-lines file results are appended to")
+    parser.add_argument("--no-record", action="store_true", help="do not append to the history file")
+    args = parser.parse_args()
+
+    previous = last_record(args.history)
+    record = {"time": time.strftime("%Y-%m-%dT%H:%M:%S"), "revision": git_revision(), "modules": {}}
+
+    print(f"{'Module':<24}{'Import ms':>10}{'Process ms':>12}{'Previous':>10}  Heaviest imports")
+    for module in args.modules:
+        result = import_time(module, args.runs)
+        record["modules"][module] = result
+        before = (previous or {}).get("modules", {}).get(module)
+        before_text = f"{before['import_us'] / 1000:.1f}" if before else "-"
+        heaviest = ", ".join(f"{h['module']} {h['cumulative_us'] / 1000:.1f}" for h in result["heaviest"][:3])
+        print(f"{module:<24}{result['import_us'] / 1000:>10.1f}{result['process_ms']:>12.1f}{before_text:>10}  {heaviest}")
+
+    if not args.no_record:
+        with open(args.history, "a") as f:
+            f.write(json.dumps(record) + "\n")
+
+
+if __name__ == "__main__":
+    main()
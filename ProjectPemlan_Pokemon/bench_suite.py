@@ -0,0 +1,207 @@
+import json
+import platform
+import random
+import sys
+import time
+import timeit
+
+from battle_core import Pokemon, BattleSimulator, pokemon_options
+from headless import run_battle
+
+# Every result is a time per operation in microseconds, so lower is better.
+# A benchmark returns one number, or a dict of numbers for parameterised runs.
+benchmarks = []
+
+
+def benchmark(name):
+    def register(func):
+        benchmarks.append((name, func))
+        return func
+    return register
+
+
+def best_time(stmt, setup=lambda: None, number=10000, repeat=5):
+    # Best of `repeat` runs of `number` calls, in microseconds per call
+    timer = timeit.Timer(stmt, setup)
+    return min(timer.repeat(repeat=repeat, number=number)) / number * 1e6
+
+
+@benchmark("pokemon.attack")
+def bench_attack():
+    attacker = Pokemon("Charmander", "fire", 100)
+    target = Pokemon("Bulbasaur", "grass", float("inf"))
+    return best_time(lambda: attacker.attack(target, "Scratch"), number=200000)
+
+
+@benchmark("pokemon.get_effectiveness")
+def bench_get_effectiveness():
+    pokemon = Pokemon("Squirtle", "water", 100)
+    return best_time(lambda: pokemon.get_effectiveness("fire"), number=200000)
+
+
+@benchmark("pokemon.receive_damage")
+def bench_receive_damage():
+    pokemon = Pokemon("Squirtle", "water", float("inf"))
+    return best_time(lambda: pokemon.receive_damage(10), number=200000)
+
+
+@benchmark("pokemon.construct")
+def bench_construct():
+    return best_time(lambda: Pokemon("Squirtle", "water", 100), number=100000)
+
+
+@benchmark("simulator.player_attack")
+def bench_player_attack():
+    simulator = None
+
+    def setup():
+        nonlocal simulator
+        simulator = BattleSimulator(Pokemon("Charmander", "fire", float("inf")), Pokemon("Squirtle", "water", float("inf")), seed=1)
+    return best_time(lambda: simulator.player_attack("Scratch"), setup, number=1000)
+
+
+@benchmark("battle.full_headless")
+def bench_full_battle():
+    rng = random.Random(1)
+    player, opponent = pokemon_options[0], pokemon_options[1]
+    return best_time(lambda: run_battle(player, opponent, rng), number=5000)
+
+
+@benchmark("image.decode_resize")
+def bench_decode_resize():
+    from PIL import Image
+    from asset_cache import find_asset, SPRITE_SIZE
+    path = find_asset("squirtle")
+    return best_time(lambda: Image.open(path).resize(SPRITE_SIZE, Image.BICUBIC), number=50)
+
+
+@benchmark("image.sprite_cache_hit")
+def bench_sprite_cache_hit():
+    from asset_cache import SpriteCache
+    cache = SpriteCache()
+    cache.get("squirtle")
+    return best_time(lambda: cache.get("squirtle"), number=100000)
+
+
+@benchmark("ui.update_battle_log")
+def bench_update_battle_log():
+    # Cost of one attack plus log refresh with `length` entries already
+    # shown. Needs a display (Xvfb is fine); returns {} when Tk cannot start.
+    try:
+        import tkinter as tk
+        root = tk.Tk()
+    except Exception:
+        print("skipping ui.update_battle_log: no display", file=sys.stderr)
+        return {}
+    from battle_window import BattleLogWindow
+
+    # Large but finite so nobody is knocked out; HP is topped up every step
+    # so the window always shows a battle in progress
+    hp = 1e9
+    results = {}
+    try:
+        root.withdraw()
+        for length in (10, 100, 1000):
+            window_root = tk.Toplevel(root)
+            player = Pokemon("Charmander", "fire", hp)
+            opponent = Pokemon("Squirtle", "water", hp)
+            simulator = BattleSimulator(player, opponent, log_capacity=max(length * 4, 1024), seed=1)
+            window = BattleLogWindow(window_root, player, simulator)
+            for _ in range(length):
+                simulator.player_attack("Scratch")
+            window.update_battle_log()
+            window_root.update_idletasks()
+
+            def step():
+                player.hp = opponent.hp = hp
+                simulator.player_attack("Scratch")
+                window.update_battle_log()
+                window_root.update_idletasks()
+            results[f"ui.update_battle_log@{length}"] = best_time(step, number=50, repeat=3)
+            window_root.destroy()
+    finally:
+        root.destroy()
+    return results
+
+
+def run_all(selected=None):
+    results = {}
+    for name, func in benchmarks:
+        if selected and not any(name.startswith(prefix) for prefix in selected):
+            continue
+        try:
+            value = func()
+        except ImportError as e:
+            print(f"skipping {name}: {e}", file=sys.stderr)
+            continue
+        except Exception as e:
+            # One broken benchmark should not cost the results of the rest
+            print(f"{name} failed: {type(e).__name__}: {e}", file=sys.stderr)
+            continue
+        if isinstance(value, dict):
+            results.update(value)
+        else:
+            results[name] = value
+    return results
+
+
+def compare(results, baseline, tolerance):
+    # Returns (name, baseline, current, ratio) for everything slower than
+    # baseline by more than `tolerance`
+    regressions = []
+    for name, value in results.items():
+        before = baseline.get(name)
+        if before:
+            ratio = value / before
+            if ratio > 1 + tolerance:
+                regressions.append((name, before, value, ratio))
+    return regressions
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmarks for the battle core and UI paths (us per operation)")
+    parser.add_argument("only", nargs="*", help="run only benchmarks whose name starts with one of these")
+    parser.add_argument("-o", "--output", help="write results as JSON to this file")
+    parser.add_argument("-b", "--baseline", help="JSON results to compare against")
+    parser.add_argument("-t", "--tolerance", type=float, default=0.10, help="allowed slowdown before failing (0.10 = 10%%)")
+    args = parser.parse_args()
+
+    results = run_all(args.only)
+    report = {
+        "meta": {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "unit": "us/op",
+        },
+        "results": results,
+    }
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+
+    print(f"{'Benchmark':<32}{'us/op':>12}{'Baseline':>12}{'Change':>10}")
+    for name, value in results.items():
+        before = baseline.get(name)
+        change = f"{100 * (value / before - 1):+.1f}%" if before else ""
+        before_text = f"{before:.3f}" if before else ""
+        print(f"{name:<32}{value:>12.3f}{before_text:>12}{change:>10}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) over {100 * args.tolerance:.0f}%:")
+        for name, before, value, ratio in regressions:
+            print(f"  {name}: {before:.3f} -> {value:.3f} us/op (x{ratio:.2f})")
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
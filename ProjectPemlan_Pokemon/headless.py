@@ -0,0 +1,174 @@
+import random
+import time
+from collections import Counter, namedtuple
+
+from battle_core import Pokemon, BattleSimulator, pokemon_options, random_policy, effectiveness_matrix
+from battle_events import PLAYER, OPPONENT
+
+# Battles that last longer than this are counted as a draw
+MAX_TURNS = 1000
+
+
+class MatchupStats:
+    def __init__(self, player_name, opponent_name):
+        self.player_name = player_name
+        self.opponent_name = opponent_name
+        self.battles = 0
+        self.player_wins = 0
+        self.opponent_wins = 0
+        self.draws = 0
+        self.total_turns = 0
+        self.player_hits = Counter()
+        self.opponent_hits = Counter()
+
+    def win_rate(self):
+        return self.player_wins / self.battles if self.battles else 0.0
+
+    def average_turns(self):
+        return self.total_turns / self.battles if self.battles else 0.0
+
+
+# One finished battle. hits is a list of (actor, skill, multiplier, damage)
+# per attack when the battle was run with detail, otherwise None.
+BattleOutcome = namedtuple("BattleOutcome", "player opponent winner turns hits")
+
+
+class RecordingPolicy:
+    # Passes the choice through to another policy and remembers it, so the
+    # opponent's skill is known without keeping an event log
+    def __init__(self, policy=random_policy):
+        self.policy = policy
+        self.skill = None
+
+    def choose_skill(self, simulator):
+        self.skill = self.policy.choose_skill(simulator)
+        return self.skill
+
+
+def run_battle(player_choice, opponent_choice, rng=random, stats=None, hits=None):
+    # Pass a list as hits to have every attack appended to it
+    player_pokemon = Pokemon(player_choice["name"], player_choice["element"], player_choice["hp"])
+    opponent_pokemon = Pokemon(opponent_choice["name"], opponent_choice["element"], opponent_choice["hp"])
+    recorder = RecordingPolicy() if hits is not None else random_policy
+    simulator = BattleSimulator(player_pokemon, opponent_pokemon, log=False, rng=rng, opponent_policy=recorder)
+    player_multiplier = effectiveness_matrix[player_pokemon.element_id][opponent_pokemon.element_id]
+    opponent_multiplier = effectiveness_matrix[opponent_pokemon.element_id][player_pokemon.element_id]
+
+    player_skills = list(player_pokemon.skills.keys())
+    turns = 0
+    while not (player_pokemon.is_knocked_out() or opponent_pokemon.is_knocked_out()):
+        if turns == MAX_TURNS:
+            break
+        turns += 1
+        player_hp = player_pokemon.hp
+        opponent_hp = opponent_pokemon.hp
+        skill = rng.choice(player_skills)
+        simulator.player_attack(skill)
+
+        if stats is not None:
+            stats.player_hits[opponent_hp - opponent_pokemon.hp] += 1
+            if not opponent_pokemon.is_knocked_out():
+                stats.opponent_hits[player_hp - player_pokemon.hp] += 1
+        if hits is not None:
+            hits.append((PLAYER, skill, player_multiplier, opponent_hp - opponent_pokemon.hp))
+            if not opponent_pokemon.is_knocked_out():
+                hits.append((OPPONENT, recorder.skill, opponent_multiplier, player_hp - player_pokemon.hp))
+
+    if opponent_pokemon.is_knocked_out():
+        winner = "player"
+    elif player_pokemon.is_knocked_out():
+        winner = "opponent"
+    else:
+        winner = None
+
+    if stats is not None:
+        stats.battles += 1
+        stats.total_turns += turns
+        if winner == "player":
+            stats.player_wins += 1
+        elif winner == "opponent":
+            stats.opponent_wins += 1
+        else:
+            stats.draws += 1
+
+    return winner, turns
+
+
+def simulate(battles_per_matchup, roster=None, seed=None):
+    roster = roster or pokemon_options
+    # Player and opponent moves all come from this one generator, so a run
+    # is repeatable from its seed
+    rng = random.Random(seed)
+
+    results = []
+    for player_choice in roster:
+        for opponent_choice in roster:
+            stats = MatchupStats(player_choice["name"], opponent_choice["name"])
+            for _ in range(battles_per_matchup):
+                run_battle(player_choice, opponent_choice, rng, stats)
+            results.append(stats)
+    return results
+
+
+def iter_battles(count=None, roster=None, seed=None, detail=False):
+    # Yields a BattleOutcome per battle, on a random matchup each time, so
+    # consumers such as stream_stats can aggregate without holding results.
+    # count=None runs forever.
+    roster = roster or pokemon_options
+    rng = random.Random(seed)
+    played = 0
+    while count is None or played < count:
+        player_choice = rng.choice(roster)
+        opponent_choice = rng.choice(roster)
+        hits = [] if detail else None
+        winner, turns = run_battle(player_choice, opponent_choice, rng, hits=hits)
+        yield BattleOutcome(player_choice["name"], opponent_choice["name"], winner, turns, hits)
+        played += 1
+
+
+def format_report(results, elapsed=None):
+    lines = [f"{'Player':<12}{'Opponent':<12}{'Battles':>10}{'Win %':>8}{'Lose %':>8}{'Draw %':>8}{'Turns':>8}"]
+    total = 0
+    for stats in results:
+        total += stats.battles
+        lines.append(
+            f"{stats.player_name:<12}{stats.opponent_name:<12}{stats.battles:>10}"
+            f"{100 * stats.win_rate():>8.1f}"
+            f"{100 * stats.opponent_wins / max(stats.battles, 1):>8.1f}"
+            f"{100 * stats.draws / max(stats.battles, 1):>8.1f}"
+            f"{stats.average_turns():>8.2f}"
+        )
+
+    lines.append("")
+    lines.append("HP removed per hit (damage: count)")
+    for stats in results:
+        player_hits = ", ".join(f"{damage:g}: {count}" for damage, count in sorted(stats.player_hits.items()))
+        opponent_hits = ", ".join(f"{damage:g}: {count}" for damage, count in sorted(stats.opponent_hits.items()))
+        lines.append(f"{stats.player_name} vs {stats.opponent_name}")
+        lines.append(f"  {stats.player_name}: {player_hits}")
+        lines.append(f"  {stats.opponent_name}: {opponent_hits}")
+
+    if elapsed:
+        lines.append("")
+        lines.append(f"{total} battles in {elapsed:.2f}s ({total / elapsed:,.0f} battles/s)")
+    return "\n".join(lines)
+
+
+def main():
+    # Only the CLI needs argparse; keeping it out of module import makes
+    # spawning headless workers cheaper
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run Pokemon battles without the GUI and report statistics")
+    parser.add_argument("-n", "--battles", type=int, default=10000, help="battles per matchup")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    results = simulate(args.battles, seed=args.seed)
+    elapsed = time.perf_counter() - start
+    print(format_report(results, elapsed))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,276 @@
+import atexit
+import bisect
+import functools
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+# Timing for the battle hot paths. enable() swaps timed wrappers onto the
+# classes and disable() puts the original functions back, so nothing is
+# paid while instrumentation is off and no battle code has to change.
+#
+# Times are inclusive: player_attack contains opponent_attack, which
+# contains Pokemon.attack.
+
+# (module, class, method, phase name)
+TARGETS = [
+    ("battle_core", "BattleSimulator", "player_attack", "player_attack"),
+    ("battle_core", "BattleSimulator", "opponent_attack", "opponent_attack"),
+    ("battle_core", "Pokemon", "attack", "pokemon_attack"),
+    ("battle_window", "BattleLogWindow", "update_battle_log", "update_battle_log"),
+    # update_battle_log defers the Text widget work to this idle callback
+    ("battle_window", "BattleLogWindow", "render_new_entries", "render_new_entries"),
+]
+
+PROFILE_MODES = (None, "cprofile", "sample")
+
+# Upper bounds of the latency buckets in seconds, as in a Prometheus histogram
+BUCKETS = (
+    1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4,
+    1e-3, 2.5e-3, 5e-3, 1e-2, 2.5e-2, 5e-2, 0.1, 0.25, 0.5, 1.0,
+)
+
+
+class LatencyHistogram:
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, seconds):
+        self.counts[bisect.bisect_left(BUCKETS, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+
+    def quantile(self, q):
+        # Upper bound of the bucket holding the q-th observation
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(BUCKETS, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+
+class StackSampler:
+    # Records the stack of one thread every `interval` seconds from a
+    # background thread. Stacks are kept collapsed ("outer;inner"), which is
+    # the input format of most flame graph tools.
+    def __init__(self, thread_id=None, interval=0.005):
+        self.thread_id = thread_id or threading.get_ident()
+        self.interval = interval
+        self.stacks = Counter()
+        self.samples = 0
+        self.running = threading.Event()
+        self.thread = None
+
+    def start(self):
+        self.running.set()
+        self.thread = threading.Thread(target=self.run, name="stack-sampler", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.running.clear()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+    def run(self):
+        while self.running.is_set():
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                names = []
+                while frame is not None:
+                    code = frame.f_code
+                    names.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                    frame = frame.f_back
+                self.stacks[";".join(reversed(names))] += 1
+                self.samples += 1
+            time.sleep(self.interval)
+
+    def collapsed(self):
+        return "\n".join(f"{stack} {count}" for stack, count in self.stacks.most_common())
+
+    def report(self, limit=15):
+        # Share of samples in which each function was on top of the stack
+        leaves = Counter()
+        for stack, count in self.stacks.items():
+            leaves[stack.rsplit(";", 1)[-1]] += count
+        lines = [f"{self.samples} stack samples every {1000 * self.interval:g} ms"]
+        for name, count in leaves.most_common(limit):
+            lines.append(f"{100 * count / max(self.samples, 1):6.1f}%  {name}")
+        return "\n".join(lines)
+
+
+histograms = {}
+_originals = {}
+_profiler = None
+_sampler = None
+
+
+def _timed(func, histogram):
+    @functools.wraps(func)
+    def timed(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            histogram.observe(time.perf_counter() - start)
+    return timed
+
+
+def enable(profile=None, ui=None):
+    # profile is None, "cprofile" or "sample". The UI refresh is wrapped
+    # when ui is true, or by default when battle_window is already loaded,
+    # so headless runs never import tkinter.
+    global _profiler, _sampler
+    if profile not in PROFILE_MODES:
+        raise ValueError(f"Unknown profile mode: {profile}")
+    if _originals:
+        return
+    if ui is None:
+        ui = "battle_window" in sys.modules
+
+    import importlib
+    for module_name, class_name, method, phase in TARGETS:
+        if module_name == "battle_window" and not ui:
+            continue
+        cls = getattr(importlib.import_module(module_name), class_name)
+        histogram = histograms.setdefault(phase, LatencyHistogram())
+        _originals[(cls, method)] = cls.__dict__[method]
+        setattr(cls, method, _timed(cls.__dict__[method], histogram))
+
+    if profile == "cprofile":
+        import cProfile
+        _profiler = cProfile.Profile()
+        _profiler.enable()
+    elif profile == "sample":
+        _sampler = StackSampler()
+        _sampler.start()
+
+
+def disable():
+    for (cls, method), func in _originals.items():
+        setattr(cls, method, func)
+    _originals.clear()
+    if _profiler is not None:
+        _profiler.disable()
+    if _sampler is not None:
+        _sampler.stop()
+
+
+def is_enabled():
+    return bool(_originals)
+
+
+def reset():
+    # Zeroed in place, since enabled wrappers hold on to their histograms.
+    # A running profiler or sampler is stopped before it is dropped.
+    global _profiler, _sampler
+    for histogram in histograms.values():
+        histogram.__init__()
+    if _profiler is not None:
+        _profiler.disable()
+    if _sampler is not None:
+        _sampler.stop()
+    _profiler = None
+    _sampler = None
+
+
+def profile_report(limit=20):
+    if _profiler is not None:
+        import io
+        import pstats
+        out = io.StringIO()
+        pstats.Stats(_profiler, stream=out).sort_stats("cumulative").print_stats(limit)
+        return out.getvalue()
+    if _sampler is not None:
+        return _sampler.report(limit)
+    return ""
+
+
+def report():
+    lines = [f"{'Phase':<20}{'Calls':>10}{'Total ms':>12}{'Mean us':>10}{'p50 us':>10}{'p99 us':>10}"]
+    for phase, histogram in histograms.items():
+        mean = histogram.sum / histogram.count if histogram.count else 0.0
+        lines.append(
+            f"{phase:<20}{histogram.count:>10}{1000 * histogram.sum:>12.2f}{1e6 * mean:>10.2f}"
+            f"{1e6 * histogram.quantile(0.5):>10g}{1e6 * histogram.quantile(0.99):>10g}"
+        )
+    profile = profile_report()
+    if profile:
+        lines.append("")
+        lines.append(profile)
+    return "\n".join(lines)
+
+
+def prometheus():
+    lines = [
+        "# HELP pokemon_phase_seconds Time spent per call in each battle phase",
+        "# TYPE pokemon_phase_seconds histogram",
+    ]
+    for phase, histogram in histograms.items():
+        cumulative = 0
+        for bound, count in zip(BUCKETS, histogram.counts):
+            cumulative += count
+            lines.append(f'pokemon_phase_seconds_bucket{{phase="{phase}",le="{bound:g}"}} {cumulative}')
+        lines.append(f'pokemon_phase_seconds_bucket{{phase="{phase}",le="+Inf"}} {histogram.count}')
+        lines.append(f'pokemon_phase_seconds_sum{{phase="{phase}"}} {histogram.sum!r}')
+        lines.append(f'pokemon_phase_seconds_count{{phase="{phase}"}} {histogram.count}')
+    return "\n".join(lines) + "\n"
+
+
+def enable_from_env():
+    # POKEMON_INSTRUMENT=1, =cprofile or =sample turns instrumentation on for
+    # the whole process. The report goes to stderr at exit, or to the file in
+    # POKEMON_INSTRUMENT_OUT (Prometheus text if it ends in .prom).
+    mode = os.environ.get("POKEMON_INSTRUMENT")
+    if not mode or mode == "0":
+        return False
+    profile = None if mode == "1" else mode
+    if profile not in PROFILE_MODES:
+        print(f"Ignoring POKEMON_INSTRUMENT={mode}: expected 1, cprofile or sample", file=sys.stderr)
+        return False
+    enable(profile=profile, ui=True)
+
+    def write_report():
+        disable()
+        path = os.environ.get("POKEMON_INSTRUMENT_OUT")
+        if not path:
+            print(report(), file=sys.stderr)
+            return
+        with open(path, "w") as f:
+            f.write(prometheus() if path.endswith(".prom") else report() + "\n")
+
+    atexit.register(write_report)
+    return True
+
+
+def main():
+    import argparse
+    import random
+    from headless import run_battle
+    from battle_core import pokemon_options
+
+    parser = argparse.ArgumentParser(description="Time the battle hot paths over a headless run")
+    parser.add_argument("-n", "--battles", type=int, default=20000)
+    parser.add_argument("--profile", choices=["cprofile", "sample"])
+    parser.add_argument("--prometheus", action="store_true", help="print Prometheus text instead of the report")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    enable(profile=args.profile, ui=False)
+    for _ in range(args.battles):
+        run_battle(rng.choice(pokemon_options), rng.choice(pokemon_options), rng)
+    disable()
+    print(prometheus() if args.prometheus else report())
+
+
+if __name__ == "__main__":
+    main()
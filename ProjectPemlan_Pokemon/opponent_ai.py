@@ -0,0 +1,164 @@
+import random
+import time
+
+from battle_core import Pokemon, BattleSimulator, pokemon_options
+
+
+class SearchTimeout(Exception):
+    pass
+
+
+class ExpectimaxPolicy:
+    # Search-based opponent. The opponent maximises its chance of winning and
+    # the player is treated as picking uniformly from its skills. A state is
+    # just the (player HP, opponent HP) pair and damage per skill is
+    # precomputed per matchup, so the search never copies Pokemon objects.
+    #
+    # Each move is searched with iterative deepening until time_budget
+    # seconds have passed, keeping the best move of the last finished depth.
+    # Results go into a transposition table per matchup that is kept across
+    # turns and battles, so later turns mostly start from cached values.
+    CHECK_EVERY = 256
+
+    def __init__(self, time_budget=0.004, max_depth=64):
+        self.time_budget = time_budget
+        self.max_depth = max_depth
+        self.tables = {}
+        self.nodes = 0
+        self.deadline = 0.0
+        self.last_depth = 0
+
+    def matchup(self, player_pokemon, opponent_pokemon):
+        key = (player_pokemon.name, player_pokemon.element, opponent_pokemon.name, opponent_pokemon.element)
+        table = self.tables.get(key)
+        if table is None:
+            opponent_multiplier = opponent_pokemon.get_effectiveness(player_pokemon.element)
+            player_multiplier = player_pokemon.get_effectiveness(opponent_pokemon.element)
+            opponent_moves = tuple((skill, damage * opponent_multiplier) for skill, damage in opponent_pokemon.skills.items())
+            player_damage = tuple(damage * player_multiplier for damage in player_pokemon.skills.values())
+            # Transposition entries are (depth searched, value, best skill);
+            # depth None marks a value that is exact
+            table = self.tables[key] = (opponent_moves, player_damage, {})
+        return table
+
+    def choose_skill(self, simulator):
+        player = simulator.player_pokemon
+        opponent = simulator.opponent_pokemon
+        opponent_moves, player_damage, transpositions = self.matchup(player, opponent)
+        if not opponent_moves:
+            return None
+
+        self.nodes = 0
+        self.deadline = time.perf_counter() + self.time_budget
+        best = opponent_moves[0][0]
+        for depth in range(1, self.max_depth + 1):
+            try:
+                _, skill, exact = self.search(player.hp, opponent.hp, depth, opponent_moves, player_damage, transpositions)
+            except SearchTimeout:
+                break
+            best = skill
+            self.last_depth = depth
+            if exact:
+                break
+        return best
+
+    def search(self, player_hp, opponent_hp, depth, opponent_moves, player_damage, transpositions):
+        # Value (opponent win chance) of the opponent to move, its best
+        # skill, and whether the value is exact rather than a depth cut-off
+        key = (player_hp, opponent_hp)
+        entry = transpositions.get(key)
+        if entry is not None and (entry[0] is None or entry[0] >= depth):
+            return entry[1], entry[2], entry[0] is None
+
+        self.nodes += 1
+        if self.nodes % self.CHECK_EVERY == 0 and time.perf_counter() > self.deadline:
+            raise SearchTimeout
+
+        best_value = -1.0
+        best_skill = None
+        best_exact = True
+        for skill, damage in opponent_moves:
+            hp = player_hp - damage
+            if hp <= 0:
+                value, exact = 1.0, True
+            elif depth == 1 or not player_damage:
+                value, exact = self.estimate(hp, opponent_hp), False
+            else:
+                value = 0.0
+                exact = True
+                for player_hit in player_damage:
+                    remaining = opponent_hp - player_hit
+                    if remaining > 0:
+                        next_value, _, next_exact = self.search(hp, remaining, depth - 1, opponent_moves, player_damage, transpositions)
+                        value += next_value
+                        exact = exact and next_exact
+                value /= len(player_damage)
+            if value > best_value:
+                best_value, best_skill, best_exact = value, skill, exact
+            elif value == best_value:
+                best_exact = best_exact and exact
+
+        transpositions[key] = (None if best_exact else depth, best_value, best_skill)
+        return best_value, best_skill, best_exact
+
+    def estimate(self, player_hp, opponent_hp):
+        # Leaf guess from the share of HP left on each side
+        return opponent_hp / (player_hp + opponent_hp)
+
+
+class TimedPolicy:
+    def __init__(self, policy):
+        self.policy = policy
+        self.calls = 0
+        self.total = 0.0
+        self.worst = 0.0
+
+    def choose_skill(self, simulator):
+        start = time.perf_counter()
+        skill = self.policy.choose_skill(simulator)
+        elapsed = time.perf_counter() - start
+        self.calls += 1
+        self.total += elapsed
+        self.worst = max(self.worst, elapsed)
+        return skill
+
+
+def play(policy, battles, rng):
+    # Random player against `policy`; returns the opponent's win rate and
+    # the mean and worst time per opponent move in seconds
+    wins = moves = 0
+    total_time = worst = 0.0
+    for _ in range(battles):
+        player_choice = rng.choice(pokemon_options)
+        opponent_choice = rng.choice(pokemon_options)
+        player = Pokemon(player_choice["name"], player_choice["element"], player_choice["hp"])
+        opponent = Pokemon(opponent_choice["name"], opponent_choice["element"], opponent_choice["hp"])
+        timed = TimedPolicy(policy)
+        simulator = BattleSimulator(player, opponent, log=False, rng=rng, opponent_policy=timed)
+        skills = list(player.skills)
+        while not player.is_knocked_out() and not opponent.is_knocked_out():
+            simulator.player_attack(rng.choice(skills))
+        wins += player.is_knocked_out()
+        moves += timed.calls
+        total_time += timed.total
+        worst = max(worst, timed.worst)
+    return wins / battles, total_time / max(moves, 1), worst
+
+
+def main():
+    import argparse
+    from battle_core import random_policy
+
+    parser = argparse.ArgumentParser(description="Compare the search opponent with the random one")
+    parser.add_argument("-n", "--battles", type=int, default=2000)
+    parser.add_argument("-b", "--budget", type=float, default=4.0, help="time budget per opponent move in ms")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    for name, policy in (("random", random_policy), ("expectimax", ExpectimaxPolicy(args.budget / 1000))):
+        win_rate, mean, worst = play(policy, args.battles, random.Random(args.seed))
+        print(f"{name:<12}opponent wins {100 * win_rate:5.1f}%, {1000 * mean:.3f} ms/move avg, {1000 * worst:.3f} ms worst")
+
+
+if __name__ == "__main__":
+    main()
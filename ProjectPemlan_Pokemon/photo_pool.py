@@ -0,0 +1,68 @@
+from PIL import ImageTk
+
+from asset_cache import sprite_cache, SPRITE_SIZE
+
+
+class PhotoImagePool:
+    # Tk images for one Tk root, shared by every window under it. Each window
+    # that uses an image holds a reference; the image is dropped once the
+    # last window using it is destroyed.
+    def __init__(self, root):
+        self.root = root
+        self.images = {}
+        self.owners = {}
+        self.created = 0
+        self.reused = 0
+        self.released = 0
+
+    def acquire(self, owner, name, size=SPRITE_SIZE):
+        # Returns the PhotoImage for `name` at `size`, held until `owner`
+        # (any widget, usually a Toplevel) is destroyed
+        key = (name, size)
+        entry = self.images.get(key)
+        if entry is None:
+            entry = self.images[key] = [ImageTk.PhotoImage(sprite_cache.get(name, size), master=self.root), 0]
+            self.created += 1
+        else:
+            self.reused += 1
+        entry[1] += 1
+
+        path = str(owner)
+        owned = self.owners.get(path)
+        if owned is None:
+            owned = self.owners[path] = []
+            owner.bind("<Destroy>", lambda event: self.on_destroy(event, path), add="+")
+        owned.append(key)
+        return entry[0]
+
+    def on_destroy(self, event, path):
+        # A Toplevel's bindings also fire for each child being destroyed
+        if str(event.widget) == path:
+            self.release(path)
+
+    def release(self, path):
+        for key in self.owners.pop(path, ()):
+            entry = self.images[key]
+            entry[1] -= 1
+            if entry[1] == 0:
+                del self.images[key]
+                self.released += 1
+
+    def stats(self):
+        # Every reuse is one decode/resize lookup and one PIL -> Tk
+        # conversion that did not have to happen
+        return {
+            "live": len(self.images),
+            "owners": len(self.owners),
+            "created": self.created,
+            "reused": self.reused,
+            "released": self.released,
+        }
+
+
+def get_pool(widget):
+    root = widget._root()
+    pool = getattr(root, "photo_pool", None)
+    if pool is None:
+        pool = root.photo_pool = PhotoImagePool(root)
+    return pool
@@ -0,0 +1,181 @@
+import os
+import random
+import struct
+import time
+from collections import namedtuple
+
+from battle_core import Pokemon, BattleSimulator, RandomPolicy, pokemon_options
+
+# Layout (little endian):
+#   b"PKR1", seed u64
+#   player and opponent: name, element (u8 length + utf-8), hp f64
+#   turn count u16, then one byte per turn: player skill index
+#   final player hp f64, final opponent hp f64
+MAGIC = b"PKR1"
+HEADER = struct.Struct("<4sQ")
+HP = struct.Struct("<d")
+TURNS = struct.Struct("<H")
+TRAILER = struct.Struct("<dd")
+
+Replay = namedtuple("Replay", "seed player opponent moves final_hp")
+
+
+class ReplayError(ValueError):
+    pass
+
+
+def _pack_text(text):
+    data = text.encode("utf-8")
+    return bytes([len(data)]) + data
+
+
+def _pack_pokemon(spec):
+    return _pack_text(spec["name"]) + _pack_text(spec["element"]) + HP.pack(spec["hp"])
+
+
+def encode(simulator, player_spec, opponent_spec):
+    # player_spec/opponent_spec describe the Pokemon as they were at the
+    # start of the battle, in the same shape as pokemon_options entries
+    if simulator.seed is None:
+        raise ReplayError("Battle was run with a shared rng and has no seed to replay from")
+    if not isinstance(simulator.opponent_policy, RandomPolicy):
+        raise ReplayError("Only battles against the random opponent can be replayed")
+    if len(simulator.moves) > 0xFFFF:
+        raise ReplayError("Battle is too long to store")
+    return b"".join([
+        HEADER.pack(MAGIC, simulator.seed),
+        _pack_pokemon(player_spec),
+        _pack_pokemon(opponent_spec),
+        TURNS.pack(len(simulator.moves)),
+        bytes(simulator.moves),
+        TRAILER.pack(simulator.player_pokemon.hp, simulator.opponent_pokemon.hp),
+    ])
+
+
+def decode(data):
+    try:
+        magic, seed = HEADER.unpack_from(data, 0)
+        if magic != MAGIC:
+            raise ReplayError("Not a battle replay")
+        offset = HEADER.size
+        specs = []
+        for _ in range(2):
+            spec = {}
+            for key in ("name", "element"):
+                length = data[offset]
+                spec[key] = data[offset + 1:offset + 1 + length].decode("utf-8")
+                offset += 1 + length
+            spec["hp"], = HP.unpack_from(data, offset)
+            offset += HP.size
+            specs.append(spec)
+        turns, = TURNS.unpack_from(data, offset)
+        offset += TURNS.size
+        moves = bytes(data[offset:offset + turns])
+        offset += turns
+        final_hp = TRAILER.unpack_from(data, offset)
+    except (struct.error, IndexError, UnicodeDecodeError) as e:
+        raise ReplayError(f"Corrupt replay: {e}") from e
+    return Replay(seed, specs[0], specs[1], moves, final_hp)
+
+
+def run(replay, log=False):
+    try:
+        player = Pokemon(replay.player["name"], replay.player["element"], replay.player["hp"])
+        opponent = Pokemon(replay.opponent["name"], replay.opponent["element"], replay.opponent["hp"])
+    except ValueError as e:
+        raise ReplayError(f"Cannot rebuild battle: {e}") from e
+    simulator = BattleSimulator(player, opponent, log=log, seed=replay.seed)
+    skills = tuple(player.skills)
+    for move in replay.moves:
+        if player.is_knocked_out() or opponent.is_knocked_out():
+            break
+        simulator.player_attack(skills[move] if move < len(skills) else "")
+    return simulator
+
+
+def verify(data):
+    # Re-runs the battle and compares the final HP of both sides bit for bit
+    replay = decode(data)
+    simulator = run(replay)
+    final_hp = TRAILER.pack(simulator.player_pokemon.hp, simulator.opponent_pokemon.hp)
+    return final_hp == TRAILER.pack(*replay.final_hp) and bytes(simulator.moves) == replay.moves
+
+
+def save(path, simulator, player_spec, opponent_spec):
+    with open(path, "wb") as f:
+        f.write(encode(simulator, player_spec, opponent_spec))
+
+
+def load(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def record_random_battles(count, directory, seed=None):
+    rng = random.Random(seed)
+    os.makedirs(directory, exist_ok=True)
+    for i in range(count):
+        player_spec = rng.choice(pokemon_options)
+        opponent_spec = rng.choice(pokemon_options)
+        player = Pokemon(player_spec["name"], player_spec["element"], player_spec["hp"])
+        opponent = Pokemon(opponent_spec["name"], opponent_spec["element"], opponent_spec["hp"])
+        simulator = BattleSimulator(player, opponent, log=False, seed=rng.getrandbits(64))
+        skills = list(player.skills)
+        while not (player.is_knocked_out() or opponent.is_knocked_out()):
+            simulator.player_attack(rng.choice(skills))
+        save(os.path.join(directory, f"battle_{i:06d}.pkr"), simulator, player_spec, opponent_spec)
+
+
+def main():
+    # Only the CLI needs argparse; keeping it out of module import makes
+    # spawning headless workers cheaper
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Record, verify and show battle replays")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    record = commands.add_parser("record", help="record random battles for a regression set")
+    record.add_argument("directory")
+    record.add_argument("-n", "--count", type=int, default=1000)
+    record.add_argument("--seed", type=int, default=None)
+
+    verify_cmd = commands.add_parser("verify", help="re-run replays and check they end identically")
+    verify_cmd.add_argument("paths", nargs="+")
+
+    show = commands.add_parser("show", help="print the battle log of a replay")
+    show.add_argument("path")
+
+    args = parser.parse_args()
+
+    if args.command == "record":
+        record_random_battles(args.count, args.directory, args.seed)
+        print(f"Recorded {args.count} battles in {args.directory}")
+
+    elif args.command == "verify":
+        paths = []
+        for path in args.paths:
+            if os.path.isdir(path):
+                paths.extend(os.path.join(path, name) for name in sorted(os.listdir(path)) if name.endswith(".pkr"))
+            else:
+                paths.append(path)
+        start = time.perf_counter()
+        failed = []
+        for path in paths:
+            try:
+                if not verify(load(path)):
+                    failed.append((path, ""))
+            except ReplayError as e:
+                failed.append((path, f": {e}"))
+        elapsed = time.perf_counter() - start
+        for path, reason in failed:
+            print(f"MISMATCH {path}{reason}")
+        print(f"{len(paths) - len(failed)}/{len(paths)} replays verified in {elapsed:.2f}s")
+        raise SystemExit(1 if failed else 0)
+
+    elif args.command == "show":
+        simulator = run(decode(load(args.path)), log=True)
+        print("\n".join(simulator.events.lines()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+from array import array
+
+from battle_core import Pokemon, element_ids, pokemon_skills, no_skills
+
+
+class RosterStore:
+    # Struct-of-arrays roster: one float and one small int per Pokemon.
+    # Name, element and skills live once per species in self.species.
+    def __init__(self):
+        self.species = []
+        self.species_ids = {}
+        self.species_of = array("H")
+        self.hp = array("d")
+
+    def __len__(self):
+        return len(self.hp)
+
+    def species_id(self, name, element):
+        key = (name, element)
+        species_id = self.species_ids.get(key)
+        if species_id is None:
+            if element not in element_ids:
+                raise ValueError(f"Unknown element: {element}")
+            species_id = len(self.species)
+            self.species.append((name, element, element_ids[element], pokemon_skills.get(name, no_skills)))
+            self.species_ids[key] = species_id
+        return species_id
+
+    def add(self, name, element, hp):
+        self.species_of.append(self.species_id(name, element))
+        self.hp.append(hp)
+        return len(self.hp) - 1
+
+    def name(self, index):
+        return self.species[self.species_of[index]][0]
+
+    def element(self, index):
+        return self.species[self.species_of[index]][1]
+
+    def skills(self, index):
+        return self.species[self.species_of[index]][3]
+
+    def receive_damage(self, index, damage):
+        hp = self.hp[index] - damage
+        self.hp[index] = hp if hp > 0 else 0
+
+    def is_knocked_out(self, index):
+        return self.hp[index] == 0
+
+    def pokemon(self, index):
+        # Materialise a full Pokemon for code that needs the object API,
+        # e.g. BattleSimulator or the battle window
+        name, element, _, _ = self.species[self.species_of[index]]
+        return Pokemon(name, element, self.hp[index])
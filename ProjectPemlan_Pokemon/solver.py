@@ -0,0 +1,207 @@
+import argparse
+import math
+import time
+
+from battle_core import Pokemon, RandomPolicy, pokemon_options
+
+class BattleSolver:
+    # Exact analysis of one matchup. Damage is fixed once the skill is
+    # known and the opponent picks uniformly from its skills, so a battle is
+    # a Markov chain over (player HP, opponent HP) that can be solved with
+    # memoised dynamic programming instead of Monte Carlo runs.
+    #
+    # Every value is a (win probability, expected turns) pair for the player.
+    def __init__(self, player_pokemon, opponent_pokemon):
+        player_multiplier = player_pokemon.get_effectiveness(opponent_pokemon.element)
+        opponent_multiplier = opponent_pokemon.get_effectiveness(player_pokemon.element)
+        self.all_player_moves = [(skill, damage * player_multiplier) for skill, damage in player_pokemon.skills.items()]
+        # Skills that do no damage can never finish the battle, so the
+        # optimal search leaves them out; the uniform player still picks them
+        self.player_moves = [(skill, damage) for skill, damage in self.all_player_moves if damage > 0]
+        self.opponent_damage = [damage * opponent_multiplier for damage in opponent_pokemon.skills.values()]
+        self.optimal_values = {}
+        self.uniform_values = {}
+
+    def move_outcome(self, skill_damage, player_hp, opponent_hp, continuation):
+        # (win, turns, stay) for one player skill. stay is the chance that
+        # neither side did any damage and the battle is back in the same
+        # state; win and turns leave that branch out so the caller can solve
+        # the self-loop in closed form.
+        next_opponent_hp = opponent_hp - skill_damage
+        if next_opponent_hp <= 0:
+            return 1.0, 1.0, 0.0
+        if not self.opponent_damage:
+            if next_opponent_hp == opponent_hp:
+                return 0.0, 1.0, 1.0
+            win, turns = continuation(player_hp, next_opponent_hp)
+            return win, turns + 1, 0.0
+
+        win = turns = stay = 0.0
+        for damage in self.opponent_damage:
+            hp = player_hp - damage
+            if hp <= 0:
+                continue
+            if hp == player_hp and next_opponent_hp == opponent_hp:
+                stay += 1
+            else:
+                next_win, next_turns = continuation(hp, next_opponent_hp)
+                win += next_win
+                turns += next_turns
+        turns += len(self.opponent_damage)
+        count = len(self.opponent_damage)
+        return win / count, turns / count, stay / count
+
+    def move_value(self, skill_damage, player_hp, opponent_hp, continuation):
+        # Only used with damaging skills, which can never stay in place
+        win, turns, _ = self.move_outcome(skill_damage, player_hp, opponent_hp, continuation)
+        return win, turns
+
+    def successors(self, player_hp, opponent_hp, moves):
+        # States the next turn can start from, other than this one. Neither
+        # side ever gains HP and every other move lowers one of them, so
+        # apart from the self-loops the states form no cycles.
+        for _, skill_damage in moves:
+            hp = opponent_hp - skill_damage
+            if hp <= 0:
+                continue
+            if not self.opponent_damage:
+                if hp != opponent_hp:
+                    yield player_hp, hp
+            for damage in self.opponent_damage:
+                if player_hp - damage > 0 and (damage or hp != opponent_hp):
+                    yield player_hp - damage, hp
+
+    def fill(self, player_hp, opponent_hp, values, compute, moves):
+        # Fills values for every state reachable from the given one, children
+        # first, with an explicit stack so long battles cannot hit the
+        # recursion limit
+        stack = [(player_hp, opponent_hp)]
+        while stack:
+            key = stack[-1]
+            if key in values:
+                stack.pop()
+                continue
+            missing = [state for state in self.successors(*key, moves) if state not in values]
+            if missing:
+                stack.extend(missing)
+            else:
+                stack.pop()
+                values[key] = compute(*key)
+
+    def known_optimal(self, player_hp, opponent_hp):
+        return self.optimal_values[(player_hp, opponent_hp)][0]
+
+    def best_move(self, player_hp, opponent_hp):
+        value = (0.0, 0.0), None
+        for skill, damage in self.player_moves:
+            move = self.move_value(damage, player_hp, opponent_hp, self.known_optimal)
+            # Highest win chance first, then the quickest finish
+            if value[1] is None or (move[0], -move[1]) > (value[0][0], -value[0][1]):
+                value = move, skill
+        return value
+
+    def optimal_value(self, player_hp, opponent_hp):
+        self.fill(player_hp, opponent_hp, self.optimal_values, self.best_move, self.player_moves)
+        return self.optimal_values[(player_hp, opponent_hp)][0]
+
+    def known_uniform(self, player_hp, opponent_hp):
+        return self.uniform_values[(player_hp, opponent_hp)]
+
+    def uniform_move(self, player_hp, opponent_hp):
+        # V = a + stay * V, so V = a / (1 - stay); expected turns likewise
+        if not self.all_player_moves:
+            return 0.0, 0.0
+        win = turns = stay = 0.0
+        for _, damage in self.all_player_moves:
+            move = self.move_outcome(damage, player_hp, opponent_hp, self.known_uniform)
+            win += move[0]
+            turns += move[1]
+            stay += move[2]
+        count = len(self.all_player_moves)
+        if stay == count:
+            # Nobody can ever do damage again: the battle never ends
+            return 0.0, math.inf
+        return win / (count - stay), turns / (count - stay)
+
+    def uniform_value(self, player_hp, opponent_hp):
+        # Value when the player also picks uniformly at random from all its
+        # skills, which is what the headless runner does; handy for
+        # checking Monte Carlo results
+        self.fill(player_hp, opponent_hp, self.uniform_values, self.uniform_move, self.all_player_moves)
+        return self.uniform_values[(player_hp, opponent_hp)]
+
+    def evaluate(self, player_hp, opponent_hp):
+        # Win probability and expected turns for each skill, assuming the
+        # player plays optimally afterwards
+        return {
+            skill: self.move_value(damage, player_hp, opponent_hp, self.optimal_value)
+            for skill, damage in self.player_moves
+        }
+
+    def state_estimate(self, player_hp, opponent_hp):
+        # Upper bound on the HP pairs a search from here can visit
+        if not self.player_moves:
+            return 1
+        player_steps = player_hp / min([damage for damage in self.opponent_damage if damage > 0] or [player_hp]) + 1
+        opponent_steps = opponent_hp / min(damage for _, damage in self.player_moves) + 1
+        return player_steps * opponent_steps
+
+    def optimal_move(self, player_hp, opponent_hp):
+        self.optimal_value(player_hp, opponent_hp)
+        (win, turns), skill = self.optimal_values[(player_hp, opponent_hp)]
+        return skill, win, turns
+
+
+_solvers = {}
+
+
+def get_solver(player_pokemon, opponent_pokemon):
+    # Solvers are shared per matchup so the memo tables survive across turns
+    # and battles
+    key = (player_pokemon.name, player_pokemon.element, opponent_pokemon.name, opponent_pokemon.element)
+    solver = _solvers.get(key)
+    if solver is None:
+        solver = _solvers[key] = BattleSolver(player_pokemon, opponent_pokemon)
+    return solver
+
+
+# Above this many reachable states a hint would take too long to compute on
+# the Tk thread, so optimal_move gives none
+MAX_HINT_STATES = 1000
+
+
+def optimal_move(simulator):
+    # (skill, win chance, expected turns), or (None, 0.0, 0.0) when the
+    # battle is too big to solve or the opponent does not pick at random,
+    # since every value here assumes a uniformly random opponent
+    if not isinstance(simulator.opponent_policy, RandomPolicy):
+        return None, 0.0, 0.0
+    player = simulator.player_pokemon
+    opponent = simulator.opponent_pokemon
+    if not (math.isfinite(player.hp) and math.isfinite(opponent.hp)):
+        return None, 0.0, 0.0
+    solver = get_solver(player, opponent)
+    if (player.hp, opponent.hp) not in solver.optimal_values and solver.state_estimate(player.hp, opponent.hp) > MAX_HINT_STATES:
+        return None, 0.0, 0.0
+    return solver.optimal_move(player.hp, opponent.hp)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Exact win probabilities for every matchup")
+    parser.parse_args()
+
+    print(f"{'Player':<12}{'Opponent':<12}{'Best move':<12}{'Win %':>8}{'Turns':>8}{'Random %':>10}{'Turns':>8}")
+    start = time.perf_counter()
+    for player_choice in pokemon_options:
+        for opponent_choice in pokemon_options:
+            player = Pokemon(player_choice["name"], player_choice["element"], player_choice["hp"])
+            opponent = Pokemon(opponent_choice["name"], opponent_choice["element"], opponent_choice["hp"])
+            solver = get_solver(player, opponent)
+            skill, win, turns = solver.optimal_move(player.hp, opponent.hp)
+            random_win, random_turns = solver.uniform_value(player.hp, opponent.hp)
+            print(f"{player.name:<12}{opponent.name:<12}{str(skill):<12}{100 * win:>8.1f}{turns:>8.2f}{100 * random_win:>10.1f}{random_turns:>8.2f}")
+    print(f"\nSolved in {1000 * (time.perf_counter() - start):.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+import json
+import os
+from collections import namedtuple
+from types import MappingProxyType
+
+SPECIES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "species.json")
+
+# skills maps move name -> power, read-only and shared by every Pokemon of
+# the species
+Species = namedtuple("Species", "name element hp skills")
+
+
+class SpeciesDatabase:
+    # Species and moves indexed by name, element and move. It is built once
+    # per process at import time (see battle_core), so workers forked from a
+    # process pool inherit it instead of re-reading the file.
+    # elements, when given, is the collection of element names the type
+    # chart knows; a species with any other element is rejected here rather
+    # than when a Pokemon is built mid-battle
+    def __init__(self, species, moves, elements=None):
+        self.moves = MappingProxyType(dict(moves))
+        self.species = []
+        self.by_name = {}
+        by_element = {}
+        by_move = {}
+
+        for entry in species:
+            unknown = [move for move in entry["moves"] if move not in self.moves]
+            if unknown:
+                raise ValueError(f"{entry['name']} uses unknown moves: {', '.join(unknown)}")
+            if elements is not None and entry["element"] not in elements:
+                raise ValueError(f"{entry['name']} has unknown element: {entry['element']}")
+            if entry["name"] in self.by_name:
+                raise ValueError(f"Duplicate species: {entry['name']}")
+
+            skills = MappingProxyType({move: self.moves[move] for move in entry["moves"]})
+            record = Species(entry["name"], entry["element"], entry["hp"], skills)
+            self.species.append(record)
+            self.by_name[record.name] = record
+            by_element.setdefault(record.element, []).append(record)
+            for move in skills:
+                by_move.setdefault(move, []).append(record)
+
+        self.by_element = {element: tuple(records) for element, records in by_element.items()}
+        self.by_move = {move: tuple(records) for move, records in by_move.items()}
+
+    @classmethod
+    def load(cls, path=SPECIES_PATH, elements=None):
+        with open(path) as f:
+            data = json.load(f)
+        moves = {name: move["power"] for name, move in data["moves"].items()}
+        return cls(data["species"], moves, elements)
+
+    def __len__(self):
+        return len(self.species)
+
+    def get(self, name):
+        return self.by_name.get(name)
+
+    def with_element(self, element):
+        return self.by_element.get(element, ())
+
+    def with_move(self, move):
+        return self.by_move.get(move, ())
+
+    def options(self):
+        # Same shape as the old hard-coded pokemon_options list
+        return [{"name": s.name, "element": s.element, "hp": s.hp} for s in self.species]
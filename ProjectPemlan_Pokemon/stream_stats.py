@@ -0,0 +1,217 @@
+import json
+import math
+import os
+import time
+from collections import Counter
+
+from headless import iter_battles
+
+# Memory depends only on the roster, the skills and the spread of turn
+# counts, never on how many battles were fed in, so a run can go on for as
+# long as needed and be checkpointed and resumed.
+
+
+class QuantileSketch:
+    # Log-bucketed histogram in the style of DDSketch: every value lands in
+    # bucket ceil(log(value, gamma)), so any quantile it reports is within
+    # relative_accuracy of the true one and buckets grow only with log(range)
+    def __init__(self, relative_accuracy=0.01):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.buckets = Counter()
+        self.zeros = 0
+        self.count = 0
+
+    def add(self, value, count=1):
+        if value <= 0:
+            self.zeros += count
+        else:
+            self.buckets[math.ceil(math.log(value) / self.log_gamma)] += count
+        self.count += count
+
+    def merge(self, other):
+        self.buckets.update(other.buckets)
+        self.zeros += other.zeros
+        self.count += other.count
+
+    def quantile(self, q):
+        if not self.count:
+            return 0.0
+        rank = q * (self.count - 1)
+        seen = self.zeros
+        if rank < seen:
+            return 0.0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if rank < seen:
+                # Midpoint of the bucket (gamma^(i-1), gamma^i]
+                return 2 * self.gamma ** index / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.buckets) / (self.gamma + 1)
+
+    def to_json(self):
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "zeros": self.zeros,
+            "buckets": sorted(self.buckets.items()),
+        }
+
+    @classmethod
+    def from_json(cls, data):
+        sketch = cls(data["relative_accuracy"])
+        for index, count in data["buckets"]:
+            sketch.buckets[index] = count
+        sketch.zeros = data["zeros"]
+        sketch.count = data["zeros"] + sum(sketch.buckets.values())
+        return sketch
+
+
+def effectiveness_class(multiplier):
+    if multiplier > 1:
+        return "super effective"
+    if multiplier < 1:
+        return "not very effective"
+    return "normal"
+
+
+class StreamStats:
+    def __init__(self, relative_accuracy=0.01):
+        self.relative_accuracy = relative_accuracy
+        self.battles = 0
+        # (player, opponent) -> [battles, player wins, opponent wins, draws]
+        self.matchups = {}
+        # (skill, effectiveness class) -> Counter of HP removed per hit
+        self.damage = {}
+        self.turns = QuantileSketch(relative_accuracy)
+        self.matchup_turns = {}
+
+    def update(self, outcome):
+        key = (outcome.player, outcome.opponent)
+        counts = self.matchups.get(key)
+        if counts is None:
+            counts = self.matchups[key] = [0, 0, 0, 0]
+            self.matchup_turns[key] = QuantileSketch(self.relative_accuracy)
+        counts[0] += 1
+        if outcome.winner == "player":
+            counts[1] += 1
+        elif outcome.winner == "opponent":
+            counts[2] += 1
+        else:
+            counts[3] += 1
+
+        self.turns.add(outcome.turns)
+        self.matchup_turns[key].add(outcome.turns)
+        if outcome.hits:
+            for _, skill, multiplier, damage in outcome.hits:
+                histogram_key = (skill, effectiveness_class(multiplier))
+                histogram = self.damage.get(histogram_key)
+                if histogram is None:
+                    histogram = self.damage[histogram_key] = Counter()
+                histogram[damage] += 1
+        self.battles += 1
+
+    def consume(self, outcomes, checkpoint_path=None, checkpoint_every=1000000):
+        # Feeds a generator of BattleOutcome through update(), saving a
+        # checkpoint every checkpoint_every battles and once at the end
+        for outcome in outcomes:
+            self.update(outcome)
+            if checkpoint_path and self.battles % checkpoint_every == 0:
+                self.save(checkpoint_path)
+        if checkpoint_path:
+            self.save(checkpoint_path)
+        return self
+
+    def to_json(self):
+        return {
+            "battles": self.battles,
+            "relative_accuracy": self.relative_accuracy,
+            "matchups": [
+                {"player": player, "opponent": opponent, "counts": counts, "turns": self.matchup_turns[(player, opponent)].to_json()}
+                for (player, opponent), counts in self.matchups.items()
+            ],
+            "damage": [
+                {"skill": skill, "effectiveness": effectiveness, "histogram": sorted(histogram.items())}
+                for (skill, effectiveness), histogram in self.damage.items()
+            ],
+            "turns": self.turns.to_json(),
+        }
+
+    @classmethod
+    def from_json(cls, data):
+        stats = cls(data["relative_accuracy"])
+        stats.battles = data["battles"]
+        for entry in data["matchups"]:
+            key = (entry["player"], entry["opponent"])
+            stats.matchups[key] = entry["counts"]
+            stats.matchup_turns[key] = QuantileSketch.from_json(entry["turns"])
+        for entry in data["damage"]:
+            stats.damage[(entry["skill"], entry["effectiveness"])] = Counter(dict((damage, count) for damage, count in entry["histogram"]))
+        stats.turns = QuantileSketch.from_json(data["turns"])
+        return stats
+
+    def save(self, path):
+        # Written to a temporary file and renamed over the old checkpoint, so
+        # a crash mid-write never leaves a truncated checkpoint behind
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w") as f:
+            json.dump(self.to_json(), f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            return cls.from_json(json.load(f))
+
+    def format_report(self):
+        lines = [f"{'Player':<12}{'Opponent':<12}{'Battles':>12}{'Win %':>8}{'Lose %':>8}{'Draw %':>8}{'p50':>6}{'p90':>6}{'p99':>6}"]
+        for (player, opponent), (battles, player_wins, opponent_wins, draws) in sorted(self.matchups.items()):
+            sketch = self.matchup_turns[(player, opponent)]
+            lines.append(
+                f"{player:<12}{opponent:<12}{battles:>12}"
+                f"{100 * player_wins / battles:>8.1f}{100 * opponent_wins / battles:>8.1f}{100 * draws / battles:>8.1f}"
+                + "".join(f"{sketch.quantile(q):>6.1f}" for q in (0.5, 0.9, 0.99))
+            )
+
+        lines.append("")
+        lines.append("Turns: " + ", ".join(f"p{q * 100:g} {self.turns.quantile(q):.1f}" for q in (0.5, 0.9, 0.99, 0.999)))
+
+        if self.damage:
+            lines.append("")
+            lines.append("HP removed per hit by skill and effectiveness (damage: count)")
+            for (skill, effectiveness), histogram in sorted(self.damage.items()):
+                counts = ", ".join(f"{damage:g}: {count}" for damage, count in sorted(histogram.items()))
+                lines.append(f"  {skill} ({effectiveness}): {counts}")
+        return "\n".join(lines)
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Aggregate battle statistics from a stream of headless battles in constant memory")
+    parser.add_argument("-n", "--battles", type=int, default=100000, help="battles to add to the statistics")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--checkpoint", help="file to checkpoint to; resumed from if it exists")
+    parser.add_argument("--every", type=int, default=1000000, help="battles between checkpoints")
+    parser.add_argument("--no-damage", action="store_true", help="skip per-hit damage histograms (faster)")
+    args = parser.parse_args()
+
+    if args.checkpoint and os.path.exists(args.checkpoint):
+        stats = StreamStats.load(args.checkpoint)
+        print(f"Resuming from {stats.battles} battles in {args.checkpoint}")
+        # A resumed run must not repeat the battles already counted
+        seed = None if args.seed is None else args.seed + stats.battles
+    else:
+        stats = StreamStats()
+        seed = args.seed
+
+    start = time.perf_counter()
+    stats.consume(iter_battles(args.battles, seed=seed, detail=not args.no_damage), args.checkpoint, args.every)
+    elapsed = time.perf_counter() - start
+    print(stats.format_report())
+    print(f"\n{args.battles} battles in {elapsed:.2f}s ({args.battles / elapsed:,.0f} battles/s), {stats.battles} in total")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+import random
+import time
+from array import array
+
+from battle_core import Pokemon, pokemon_options
+from battle_events import PLAYER, OPPONENT
+
+TEAM_SIZE = 6
+
+# Team battles that last longer than this are counted as a draw
+MAX_TURNS = 10000
+
+# Both sides act once per turn in this order, like BattleSimulator: the
+# player attacks first and the opponent only answers if it is still standing
+TURN_ORDER = (PLAYER, OPPONENT)
+
+
+class DamageTable:
+    # Damage of every skill of every species against every other species,
+    # effectiveness included, so a turn only indexes into tuples
+    def __init__(self, roster):
+        self.roster = list(roster)
+        self.species_ids = {entry["name"]: index for index, entry in enumerate(self.roster)}
+        self.max_hp = array("d", (entry["hp"] for entry in self.roster))
+        pokemon = [Pokemon(entry["name"], entry["element"], entry["hp"]) for entry in self.roster]
+        self.damage = [
+            [tuple(damage * attacker.get_effectiveness(target.element) for damage in attacker.skills.values()) for target in pokemon]
+            for attacker in pokemon
+        ]
+
+    def species_id(self, name):
+        species_id = self.species_ids.get(name)
+        if species_id is None:
+            raise ValueError(f"Unknown Pokemon: {name}")
+        return species_id
+
+
+class TeamBattle:
+    # Six against six, switching in the next Pokemon on a KO. All state is
+    # preallocated flat arrays indexed by side * team_size + slot, and
+    # reset() reuses them, so one TeamBattle can run any number of battles
+    # without allocating per turn or per battle.
+    def __init__(self, table, team_size=TEAM_SIZE, rng=random):
+        self.table = table
+        self.team_size = team_size
+        self.rng = rng
+        self.species = array("H", [0]) * (2 * team_size)
+        self.hp = array("d", [0]) * (2 * team_size)
+        self.active = array("B", [0, 0])
+        self.alive = array("B", [0, 0])
+        self.turn = 0
+        self.knockouts = 0
+
+    def reset(self, player_team, opponent_team):
+        # Teams are sequences of species ids from the DamageTable; a side
+        # may field fewer than team_size Pokemon
+        for side, team in ((PLAYER, player_team), (OPPONENT, opponent_team)):
+            if not 0 < len(team) <= self.team_size:
+                raise ValueError(f"A team needs 1 to {self.team_size} Pokemon")
+            base = side * self.team_size
+            for slot, species_id in enumerate(team):
+                self.species[base + slot] = species_id
+                self.hp[base + slot] = self.table.max_hp[species_id]
+            self.active[side] = 0
+            self.alive[side] = len(team)
+        self.turn = 0
+        self.knockouts = 0
+
+    def step(self):
+        # Runs one turn; returns the winning side, or None while both sides
+        # still have a Pokemon standing
+        size = self.team_size
+        damage = self.table.damage
+        hp = self.hp
+        species = self.species
+        random_value = self.rng.random
+        self.turn += 1
+
+        for side in TURN_ORDER:
+            attacker = side * size + self.active[side]
+            if hp[attacker] == 0:
+                # Knocked out earlier this turn; the switch happens below
+                continue
+            target_side = 1 - side
+            target = target_side * size + self.active[target_side]
+            skills = damage[species[attacker]][species[target]]
+            if not skills:
+                continue
+            remaining = hp[target] - skills[int(random_value() * len(skills))]
+            if remaining > 0:
+                hp[target] = remaining
+                continue
+
+            hp[target] = 0
+            self.knockouts += 1
+            self.alive[target_side] -= 1
+            if not self.alive[target_side]:
+                return side
+
+        # Pokemon knocked out this turn are replaced by the next teammate
+        for side in TURN_ORDER:
+            active = self.active[side]
+            if hp[side * size + active] == 0:
+                while hp[side * size + active] == 0:
+                    active += 1
+                self.active[side] = active
+        return None
+
+    def run(self, player_team, opponent_team, max_turns=MAX_TURNS):
+        # Returns (winning side or None for a draw, turns)
+        self.reset(player_team, opponent_team)
+        while self.turn < max_turns:
+            winner = self.step()
+            if winner is not None:
+                return winner, self.turn
+        return None, self.turn
+
+
+def run_team_battles(battles, team_size=TEAM_SIZE, roster=None, seed=None):
+    # Random teams (species may repeat) drawn from the roster for every
+    # battle. Returns (player wins, opponent wins, draws, total turns,
+    # total knockouts).
+    roster = roster or pokemon_options
+    rng = random.Random(seed)
+    table = DamageTable(roster)
+    battle = TeamBattle(table, team_size, rng)
+    species_count = len(table.roster)
+    player_team = array("H", [0]) * team_size
+    opponent_team = array("H", [0]) * team_size
+
+    wins = [0, 0]
+    draws = turns = knockouts = 0
+    for _ in range(battles):
+        for slot in range(team_size):
+            player_team[slot] = rng.randrange(species_count)
+            opponent_team[slot] = rng.randrange(species_count)
+        winner, battle_turns = battle.run(player_team, opponent_team)
+        if winner is None:
+            draws += 1
+        else:
+            wins[winner] += 1
+        turns += battle_turns
+        knockouts += battle.knockouts
+    return wins[PLAYER], wins[OPPONENT], draws, turns, knockouts
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run random team battles without the GUI")
+    parser.add_argument("-n", "--battles", type=int, default=20000)
+    parser.add_argument("--team-size", type=int, default=TEAM_SIZE)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    player_wins, opponent_wins, draws, turns, knockouts = run_team_battles(args.battles, args.team_size, seed=args.seed)
+    elapsed = time.perf_counter() - start
+
+    print(f"{args.team_size}v{args.team_size}, {args.battles} battles")
+    print(f"Player wins {100 * player_wins / args.battles:.1f}%, opponent wins {100 * opponent_wins / args.battles:.1f}%, draws {100 * draws / args.battles:.1f}%")
+    print(f"Turns per battle: {turns / args.battles:.2f}, knockouts per battle: {knockouts / args.battles:.2f}")
+    print(f"{elapsed:.2f}s ({args.battles / elapsed:,.0f} battles/s, {turns / elapsed:,.0f} turns/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+import random
+import time
+import unittest
+from types import MappingProxyType
+
+import solver
+from battle_core import Pokemon, BattleSimulator
+
+
+def charmander_with_splash(hp=100):
+    pokemon = Pokemon("Charmander", "fire", hp)
+    pokemon.skills = MappingProxyType({"Scratch": 25, "Growl": 15, "Splash": 0})
+    return pokemon
+
+
+class HintLatencyTest(unittest.TestCase):
+    # The hint is computed on the Tk thread, so even a cold call at the
+    # largest size it accepts has to stay well under a frame or two
+    BUDGET = 0.05
+
+    def test_cold_optimal_move_is_bounded(self):
+        hp = 100
+        probe = solver.BattleSolver(Pokemon("Squirtle", "water", hp), Pokemon("Squirtle", "water", hp))
+        while probe.state_estimate(hp + 10, hp + 10) <= solver.MAX_HINT_STATES:
+            hp += 10
+
+        solver._solvers.clear()
+        simulator = BattleSimulator(Pokemon("Squirtle", "water", hp), Pokemon("Squirtle", "water", hp), seed=1)
+        start = time.perf_counter()
+        skill, _, _ = solver.optimal_move(simulator)
+        elapsed = time.perf_counter() - start
+        self.assertIsNotNone(skill)
+        self.assertLess(elapsed, self.BUDGET)
+
+    def test_oversized_battle_gives_no_hint(self):
+        simulator = BattleSimulator(Pokemon("Squirtle", "water", 15000), Pokemon("Squirtle", "water", 15000), seed=1)
+        start = time.perf_counter()
+        self.assertEqual(solver.optimal_move(simulator), (None, 0.0, 0.0))
+        self.assertLess(time.perf_counter() - start, self.BUDGET)
+
+
+class UniformValueTest(unittest.TestCase):
+    def test_zero_damage_moves_match_random_battles(self):
+        player, opponent = charmander_with_splash(), charmander_with_splash()
+        expected, _ = solver.BattleSolver(player, opponent).uniform_value(100, 100)
+
+        rng = random.Random(1)
+        battles = 20000
+        wins = 0
+        for _ in range(battles):
+            player, opponent = charmander_with_splash(), charmander_with_splash()
+            simulator = BattleSimulator(player, opponent, log=False, rng=rng)
+            skills = list(player.skills)
+            while not (player.is_knocked_out() or opponent.is_knocked_out()):
+                simulator.player_attack(rng.choice(skills))
+            wins += opponent.is_knocked_out()
+        self.assertAlmostEqual(wins / battles, expected, delta=0.015)
+
+    def test_optimal_search_skips_zero_damage_moves(self):
+        player, opponent = charmander_with_splash(), charmander_with_splash()
+        battle_solver = solver.BattleSolver(player, opponent)
+        self.assertNotIn("Splash", battle_solver.evaluate(100, 100))
+
+
+if __name__ == "__main__":
+    unittest.main()
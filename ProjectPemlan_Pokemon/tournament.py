@@ -0,0 +1,164 @@
+import json
+import os
+import random
+import time
+
+from battle_core import pokemon_options, species_db, element_ids
+from headless import run_battle
+
+# Battles per work unit. Big enough that pickling a unit is noise next to
+# running it, small enough to keep every worker busy until the end.
+CHUNK_SIZE = 5000
+
+
+def load_roster(path):
+    # A roster file is a JSON list in the same shape as pokemon_options
+    with open(path) as f:
+        roster = json.load(f)
+    for entry in roster:
+        missing = {"name", "element", "hp"} - set(entry)
+        if missing:
+            raise ValueError(f"Roster entry {entry!r} is missing {', '.join(sorted(missing))}")
+        # Skills come from species.json, so an unknown species would have
+        # none and fail deep inside a worker
+        if species_db.get(entry["name"]) is None:
+            raise ValueError(f"Roster entry {entry!r} is not a species in species.json")
+        if entry["element"] not in element_ids:
+            raise ValueError(f"Roster entry {entry!r} has an element missing from the type chart")
+    return roster
+
+
+def make_work_units(roster_size, repetitions, seed, chunk_size=CHUNK_SIZE):
+    # Every ordered matchup (mirror matches included) split into chunks, each
+    # with its own seed so results do not depend on how chunks are scheduled
+    seeds = random.Random(seed)
+    units = []
+    for player in range(roster_size):
+        for opponent in range(roster_size):
+            for start in range(0, repetitions, chunk_size):
+                units.append((player, opponent, min(chunk_size, repetitions - start), seeds.getrandbits(64)))
+    return units
+
+
+def run_work_unit(roster, unit):
+    player, opponent, battles, seed = unit
+    rng = random.Random(seed)
+    wins = losses = turns = 0
+    for _ in range(battles):
+        winner, battle_turns = run_battle(roster[player], roster[opponent], rng)
+        turns += battle_turns
+        if winner == "player":
+            wins += 1
+        elif winner == "opponent":
+            losses += 1
+    return player, opponent, battles, wins, losses, turns
+
+
+def _run_chunk(args):
+    roster, units = args
+    return [run_work_unit(roster, unit) for unit in units]
+
+
+class TournamentResult:
+    def __init__(self, roster):
+        size = len(roster)
+        self.names = [entry["name"] for entry in roster]
+        self.battles = [[0] * size for _ in range(size)]
+        self.wins = [[0] * size for _ in range(size)]
+        self.losses = [[0] * size for _ in range(size)]
+        self.turns = [[0] * size for _ in range(size)]
+
+    def add(self, player, opponent, battles, wins, losses, turns):
+        self.battles[player][opponent] += battles
+        self.wins[player][opponent] += wins
+        self.losses[player][opponent] += losses
+        self.turns[player][opponent] += turns
+
+    def win_rate(self, player, opponent):
+        battles = self.battles[player][opponent]
+        return self.wins[player][opponent] / battles if battles else 0.0
+
+    def win_rate_matrix(self):
+        size = len(self.names)
+        return [[self.win_rate(p, o) for o in range(size)] for p in range(size)]
+
+    def total_battles(self):
+        return sum(map(sum, self.battles))
+
+    def to_json(self):
+        return {
+            "names": self.names,
+            "battles": self.battles,
+            "wins": self.wins,
+            "losses": self.losses,
+            "turns": self.turns,
+            "win_rate": self.win_rate_matrix(),
+        }
+
+    def format_matrix(self):
+        # Rows are the player, columns the opponent
+        width = max(10, max(len(name) for name in self.names) + 2)
+        lines = [" " * width + "".join(f"{name:>{width}}" for name in self.names)]
+        for p, name in enumerate(self.names):
+            lines.append(f"{name:<{width}}" + "".join(f"{100 * self.win_rate(p, o):>{width - 1}.1f}%" for o in range(len(self.names))))
+        return "\n".join(lines)
+
+
+def run_tournament(roster=None, repetitions=1000, workers=None, seed=None, chunk_size=CHUNK_SIZE):
+    roster = roster or pokemon_options
+    workers = workers or os.cpu_count() or 1
+    units = make_work_units(len(roster), repetitions, seed, chunk_size)
+    result = TournamentResult(roster)
+
+    if workers == 1:
+        for unit in units:
+            result.add(*run_work_unit(roster, unit))
+        return result
+
+    # Only parallel runs need the process pool; worker processes import this
+    # module too and never touch it
+    from concurrent.futures import ProcessPoolExecutor
+
+    # Hand each task a few units at a time so the roster is pickled once per
+    # batch rather than once per unit
+    batch = max(1, len(units) // (workers * 4))
+    batches = [(roster, units[i:i + batch]) for i in range(0, len(units), batch)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for counts in pool.map(_run_chunk, batches):
+            for unit_counts in counts:
+                result.add(*unit_counts)
+    return result
+
+
+def main():
+    # Only the CLI needs argparse; keeping it out of module import makes
+    # spawning tournament workers cheaper
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Round-robin tournament over a Pokemon roster")
+    parser.add_argument("-n", "--repetitions", type=int, default=1000, help="battles per matchup")
+    parser.add_argument("-r", "--roster", help="JSON roster file (defaults to the built-in Pokemon)")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--json", help="also write the result matrices to this file")
+    args = parser.parse_args()
+
+    try:
+        roster = load_roster(args.roster) if args.roster else pokemon_options
+    except ValueError as e:
+        parser.error(str(e))
+    start = time.perf_counter()
+    result = run_tournament(roster, args.repetitions, args.workers, args.seed, args.chunk_size)
+    elapsed = time.perf_counter() - start
+
+    print(result.format_matrix())
+    total = result.total_battles()
+    print(f"\n{total} battles in {elapsed:.2f}s ({total / elapsed:,.0f} battles/s)")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(result.to_json(), f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+import argparse
+import time
+
+import numpy as np
+
+from battle_core import Pokemon, pokemon_options
+from headless import MAX_TURNS, MatchupStats, format_report
+
+
+class BattleTables:
+    # Everything the kernel needs about a roster, read off real Pokemon
+    # objects so the rules stay identical to BattleSimulator
+    def __init__(self, roster):
+        pokemons = [Pokemon(p["name"], p["element"], p["hp"]) for p in roster]
+        self.names = [p.name for p in pokemons]
+        self.hp = np.array([p.hp for p in pokemons], dtype=np.float64)
+
+        max_skills = max(len(p.skills) for p in pokemons)
+        self.skill_count = np.array([len(p.skills) for p in pokemons], dtype=np.int64)
+        self.skill_damage = np.zeros((len(pokemons), max(max_skills, 1)), dtype=np.float64)
+        for i, p in enumerate(pokemons):
+            self.skill_damage[i, :len(p.skills)] = list(p.skills.values())
+
+        # effectiveness[attacker, defender]
+        self.effectiveness = np.array(
+            [[attacker.get_effectiveness(defender.element) for defender in pokemons] for attacker in pokemons],
+            dtype=np.float64,
+        )
+
+
+def _pick_damage(tables, attacker, defender, rng):
+    # Uniform skill choice per battle, same as random.choice over the skill list
+    count = tables.skill_count[attacker]
+    pick = (rng.random(len(attacker)) * count).astype(np.int64)
+    damage = tables.skill_damage[attacker, np.minimum(pick, np.maximum(count - 1, 0))]
+    damage[count == 0] = 0.0
+    return damage * tables.effectiveness[attacker, defender]
+
+
+def _count_hits(counters, matchup, removed):
+    if not len(removed):
+        return
+    # Only a handful of distinct damage values exist, so bin on
+    # (matchup, damage id) instead of sorting the pairs
+    values, value_id = np.unique(removed, return_inverse=True)
+    counts = np.bincount(matchup * len(values) + value_id, minlength=len(counters) * len(values))
+    for key in np.nonzero(counts)[0]:
+        m, v = divmod(int(key), len(values))
+        counters[m][float(values[v])] += int(counts[key])
+
+
+# Runs len(player) battles in lockstep. winner is 1 for the player,
+# -1 for the opponent and 0 for a draw
+def run_battles(tables, player, opponent, rng, collect_hits=False):
+    n = len(player)
+    player_hp = tables.hp[player].copy()
+    opponent_hp = tables.hp[opponent].copy()
+    turns = np.zeros(n, dtype=np.int64)
+    player_hits = opponent_hits = None
+    if collect_hits:
+        player_hits = ([], [])
+        opponent_hits = ([], [])
+
+    # Indices of battles still running; finished ones drop out so later
+    # turns only touch the long tail
+    active = np.arange(n)
+    for _ in range(MAX_TURNS):
+        if not len(active):
+            break
+        attacker = player[active]
+        defender = opponent[active]
+        turns[active] += 1
+
+        before = opponent_hp[active]
+        after = np.maximum(before - _pick_damage(tables, attacker, defender, rng), 0.0)
+        opponent_hp[active] = after
+        if collect_hits:
+            player_hits[0].append(active)
+            player_hits[1].append(before - after)
+
+        # Opponent only answers if it is still standing
+        answering = active[after > 0]
+        before = player_hp[answering]
+        after = np.maximum(before - _pick_damage(tables, opponent[answering], player[answering], rng), 0.0)
+        player_hp[answering] = after
+        if collect_hits:
+            opponent_hits[0].append(answering)
+            opponent_hits[1].append(before - after)
+
+        active = answering[after > 0]
+
+    winner = np.zeros(n, dtype=np.int8)
+    winner[opponent_hp == 0] = 1
+    winner[player_hp == 0] = -1
+    if collect_hits:
+        return winner, turns, player_hits, opponent_hits
+    return winner, turns
+
+
+def simulate(battles_per_matchup, roster=None, seed=None):
+    roster = roster or pokemon_options
+    tables = BattleTables(roster)
+    rng = np.random.default_rng(seed)
+
+    size = len(roster)
+    matchups = size * size
+    matchup = np.repeat(np.arange(matchups), battles_per_matchup)
+    player = matchup // size
+    opponent = matchup % size
+
+    winner, turns, player_hits, opponent_hits = run_battles(tables, player, opponent, rng, collect_hits=True)
+
+    results = [MatchupStats(tables.names[m // size], tables.names[m % size]) for m in range(matchups)]
+    battles = np.bincount(matchup, minlength=matchups)
+    player_wins = np.bincount(matchup, weights=winner == 1, minlength=matchups)
+    opponent_wins = np.bincount(matchup, weights=winner == -1, minlength=matchups)
+    total_turns = np.bincount(matchup, weights=turns, minlength=matchups)
+
+    for m, stats in enumerate(results):
+        stats.battles = int(battles[m])
+        stats.player_wins = int(player_wins[m])
+        stats.opponent_wins = int(opponent_wins[m])
+        stats.draws = stats.battles - stats.player_wins - stats.opponent_wins
+        stats.total_turns = int(total_turns[m])
+
+    for hits, attr in ((player_hits, "player_hits"), (opponent_hits, "opponent_hits")):
+        counters = [getattr(stats, attr) for stats in results]
+        _count_hits(counters, matchup[np.concatenate(hits[0])], np.concatenate(hits[1]))
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run Pokemon battles in lockstep with NumPy and report statistics")
+    parser.add_argument("-n", "--battles", type=int, default=100000, help="battles per matchup")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    results = simulate(args.battles, seed=args.seed)
+    elapsed = time.perf_counter() - start
+    print(format_report(results, elapsed))
+
+
+if __name__ == "__main__":
+    main()